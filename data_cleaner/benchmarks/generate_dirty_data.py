@@ -0,0 +1,130 @@
+import argparse
+import numpy as np
+import pandas as pd
+
+# Seeded generator for files shaped like medium_csv.csv, with the same kinds of
+# dirt: mixed date formats, "+91" phone variants, "USD 80,000" style salaries,
+# casing typos, duplicate ids and scattered nulls.
+
+COLUMNS = [
+    "id", "name", "email", "age", "experience", "date of joining", "branch",
+    "ph no", "city", "promotion_eligible", "zip_code", "current_salary",
+]
+
+FIRST_NAMES = ["John", "Jane", "Alex", "Maya", "Linda", "Tom", "Nina", "Ethan", "Meera", "Ali",
+               "Emily", "Kiran", "Olivia", "Mohit", "Ryan", "Avi", "Omar", "Samira", "Ritu", "Leo"]
+LAST_NAMES = ["Doe", "Smith", "Ray", "Lee", "White", "Wills", "Brown", "Hunt", "Khan", "Mehta",
+              "Shah", "Patel", "Singh", "Rao", "Iyer", "Das", "Nair", "Gupta", "Joshi", "Roy"]
+DOMAINS = ["example.com", "mail.com", "corp.net", "webmail.com", "company.io", "ai.com"]
+EXPERIENCE = ["Junior Dev", "junior dev", "JUNIOR DEV", "Senior Dev", "SENIOR DEV", "senior Dev",
+              "Inter", "INTER", "inter", "Junoir Dev", "Senoir Dev"]
+BRANCHES = ["backend", "BACKEND", "Backend", "frontend", "Frontend", "FRONTEND", "FrontEnd",
+            "database", "DATABASE", "Databse", "fronted"]
+CITIES = ["MUMBAI", "DELHI", "BANGALORE", "CHENNAI", "PUNE", "SURAT", "LUCKNOW", "KANPUR",
+          "NAGPUR", "INDORE", "Mumbai", "delhi", "Bangalor", "Chenai", "PUNEE"]
+BOOLEANS = ["TRUE", "FALSE", "True", "False", "true", "false"]
+DATE_FORMATS = ["%d/%m/%Y", "%Y-%m-%d", "%d.%m.%y", "%d-%m-%Y", "%Y/%m/%d", "%d/%m/%y", "%Y.%m.%d", "%d-%m-%y"]
+
+
+def _pick(rng, choices, size):
+    return np.asarray(choices, dtype=object)[rng.integers(0, len(choices), size)]
+
+
+def _digits(rng, size, length):
+    return pd.Series(rng.integers(10 ** (length - 1), 10 ** length, size)).astype(str)
+
+
+def _phones(rng, size):
+    ten = _digits(rng, size, 10)
+    kind = rng.integers(0, 6, size)
+    phones = np.select(
+        [kind == 0, kind == 1, kind == 2, kind == 3, kind == 4],
+        ["+91 " + ten, "+91" + ten, "+91-" + ten, "+91 " + ten.str[:5] + " " + ten.str[5:], "+91 " + ten.str[:7]],
+        default="+1 " + ten,
+    )
+    return phones
+
+
+def _salaries(rng, size):
+    thousands = pd.Series(rng.integers(40, 150, size)).astype(str)
+    kind = rng.integers(0, 7, size)
+    return np.select(
+        [kind == 0, kind == 1, kind == 2, kind == 3, kind == 4, kind == 5],
+        [thousands + ",000", "USD " + thousands + ",000", thousands + "000", thousands + " thousand",
+         thousands + "K", thousands + ",000 INR"],
+        default=thousands + ",000.00",
+    )
+
+
+def _dates(rng, size):
+    days = pd.Series(pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 366, size), unit="D"))
+    fmt = rng.integers(0, len(DATE_FORMATS), size)
+    dates = pd.Series(index=days.index, dtype=object)
+    for i, date_format in enumerate(DATE_FORMATS):
+        mask = fmt == i
+        dates[mask] = days[mask].dt.strftime(date_format)
+    return dates
+
+
+def generate_chunk(rows, start_id=1, seed=0, duplicate_rate=0.02, null_rate=0.01):
+    rng = np.random.default_rng(seed)
+    first = _pick(rng, FIRST_NAMES, rows)
+    last = _pick(rng, LAST_NAMES, rows)
+    ids = np.arange(start_id, start_id + rows)
+
+    df = pd.DataFrame({
+        "id": ids,
+        "name": pd.Series(first + " " + last),
+        "email": pd.Series(first + "." + last + ids.astype(str) + "@").str.lower() + _pick(rng, DOMAINS, rows),
+        "age": rng.integers(21, 60, rows),
+        "experience": _pick(rng, EXPERIENCE, rows),
+        "date of joining": _dates(rng, rows),
+        "branch": _pick(rng, BRANCHES, rows),
+        "ph no": _phones(rng, rows),
+        "city": _pick(rng, CITIES, rows),
+        "promotion_eligible": _pick(rng, BOOLEANS, rows),
+        "zip_code": rng.integers(110001, 855000, rows),
+        "current_salary": _salaries(rng, rows),
+    }, columns=COLUMNS)
+
+    # Duplicate ids: half are exact copies of an earlier row, half conflict
+    if rows > 1:
+        dupes = rng.choice(np.arange(1, rows), size=int(rows * duplicate_rate), replace=False)
+        sources = (rng.random(len(dupes)) * dupes).astype(int)
+        exact = rng.random(len(dupes)) < 0.5
+        df.iloc[dupes[exact]] = df.iloc[sources[exact]].to_numpy()
+        df.loc[dupes[~exact], "id"] = df["id"].to_numpy()[sources[~exact]]
+
+    # Scattered nulls everywhere except the id column
+    df = df.astype(object)
+    nulls = rng.random((rows, len(COLUMNS) - 1)) < null_rate
+    for i, col in enumerate(COLUMNS[1:]):
+        df.loc[nulls[:, i], col] = None
+    return df
+
+
+def generate_file(path, rows, seed=0, chunk_rows=1_000_000, **kwargs):
+    written = 0
+    while written < rows:
+        size = min(chunk_rows, rows - written)
+        chunk = generate_chunk(size, start_id=written + 1, seed=seed + written, **kwargs)
+        chunk.to_csv(path, index=False, mode="w" if written == 0 else "a", header=written == 0)
+        written += size
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a dirty CSV shaped like medium_csv.csv")
+    parser.add_argument("output", help="Path of the CSV to write")
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--duplicate-rate", type=float, default=0.02)
+    parser.add_argument("--null-rate", type=float, default=0.01)
+    args = parser.parse_args()
+    generate_file(args.output, args.rows, seed=args.seed,
+                  duplicate_rate=args.duplicate_rate, null_rate=args.null_rate)
+    print(f"Wrote {args.rows} rows to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+
+# Startup budget check for data_cleaner.py. Each import runs in a fresh
+# interpreter so nothing is already cached, and the best of --repeat runs is
+# kept. pandas is timed on its own as the floor: the budget is what the cleaning
+# package adds on top of it. Exits 1 when over budget or when a heavy optional
+# dependency gets imported at startup.
+
+HEAVY_MODULES = [
+    "ydata_profiling", "matplotlib", "scipy", "questionary", "prompt_toolkit",
+    "openpyxl", "pyfiglet", "fuzzywuzzy", "rapidfuzz", "yaml", "psutil",
+]
+
+MEASURE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+ms = (time.perf_counter() - start) * 1000
+print(json.dumps({{"ms": ms, "modules": sorted(sys.modules)}}))
+"""
+
+
+def measure(module, repeat):
+    best = None
+    for _ in range(repeat):
+        output = subprocess.check_output([sys.executable, "-c", MEASURE.format(module=module)],
+                                         cwd=ROOT_DIR, text=True)
+        result = json.loads(output.splitlines()[-1])
+        if best is None or result["ms"] < best["ms"]:
+            best = result
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that data_cleaner.py starts up within budget")
+    parser.add_argument("--budget-ms", type=float, default=150,
+                        help="Allowed import time on top of pandas (default: 150)")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    floor = measure("pandas", args.repeat)
+    startup = measure("data_cleaner", args.repeat)
+    overhead = startup["ms"] - floor["ms"]
+    heavy = [m for m in HEAVY_MODULES if m in startup["modules"]]
+
+    print(f"import pandas        {floor['ms']:8.1f} ms")
+    print(f"import data_cleaner  {startup['ms']:8.1f} ms  ({overhead:+.1f} ms on top of pandas, budget {args.budget_ms:g} ms)")
+    if heavy:
+        print(f"Heavy modules imported at startup: {', '.join(heavy)}")
+    if overhead > args.budget_ms or heavy:
+        print("❌ Startup is over budget")
+        sys.exit(1)
+    print("✅ Startup is within budget")
+
+
+if __name__ == "__main__":
+    main()
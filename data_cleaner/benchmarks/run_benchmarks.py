@@ -0,0 +1,164 @@
+import argparse
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from contextlib import redirect_stdout
+from datetime import datetime
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent))
+
+import pandas as pd
+from cleaning.io import load_file, save_file
+from cleaning.core import check_and_fix_headers, handle_duplicates_by_column, handle_null_rows
+from cleaning.inference import suggest_and_fix_column_types
+from cleaning.format_cleaning import clean_column
+from cleaning.dtypes import compact_dtypes
+from generate_dirty_data import COLUMNS, generate_file
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Times every stage of a clean on generated dirty data and saves the results as
+# JSON. A cleaning plan answers every prompt so the suite runs headless; type
+# inference still runs for real because the plan has no column_types section.
+
+DEFAULT_ROWS = [10_000]
+DATA_DIR = BENCH_DIR / "data"
+RESULTS_DIR = BENCH_DIR / "results"
+
+
+def benchmark_plan():
+    return {
+        "headers": {"keep_positions": list(range(len(COLUMNS))), "header_is_data": False, "columns": COLUMNS},
+        "date_formats": {"date of joining": "%d/%m/%Y"},
+        "dedupe": {"columns": ["id"], "keep": "first", "newest_by": None},
+        "nulls": "highlight",
+    }
+
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes on Linux
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def timed(results, stage, rows, func, *args, **kwargs):
+    start = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        result = func(*args, **kwargs)
+    seconds = time.perf_counter() - start
+    results.append({
+        "stage": stage,
+        "seconds": round(seconds, 4),
+        "rows": rows,
+        "rows_per_sec": round(rows / seconds) if seconds else None,
+        "peak_rss_mb": peak_rss_mb(),
+    })
+    print(f"  {stage:<45} {seconds:9.3f}s")
+    return result
+
+
+def run_pipeline(path, formats):
+    results = []
+    plan = benchmark_plan()
+
+    df = timed(results, "load_file", 0, load_file, str(path))
+    rows = len(df)
+    results[-1]["rows"] = rows
+    results[-1]["rows_per_sec"] = round(rows / results[-1]["seconds"]) if results[-1]["seconds"] else None
+
+    df = timed(results, "check_and_fix_headers", rows, check_and_fix_headers, df, plan=plan)
+    df = timed(results, "suggest_and_fix_column_types", rows, suggest_and_fix_column_types, df, plan=plan)
+    df = timed(results, "compact_dtypes", rows, compact_dtypes, df)
+    df = timed(results, "handle_duplicates_by_column", rows, handle_duplicates_by_column, df, plan=plan)
+    df = timed(results, "handle_null_rows", len(df), handle_null_rows, df, plan=plan)
+
+    inferred = df.attrs.get("inferred_types", {})
+    for col in df.columns:
+        inferred_type = inferred.get(col, "")
+        df[col] = timed(results, f"normalize[{inferred_type}] {col}", len(df), clean_column, df[col], inferred_type)
+
+    for ext in formats:
+        output = path.with_name(f"{path.stem}_cleaned.{ext}")
+        timed(results, f"save_file .{ext}", len(df), save_file, df, str(output))
+        output.unlink()
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=BENCH_DIR,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(old_path, new_results):
+    with open(old_path, encoding="utf-8") as f:
+        old = json.load(f)
+    old_times = {(run["rows"], s["stage"]): s["seconds"] for run in old["runs"] for s in run["stages"]}
+
+    print(f"\nComparison with {old_path} (commit {old['meta'].get('commit')}):")
+    for run in new_results["runs"]:
+        for stage in run["stages"]:
+            before = old_times.get((run["rows"], stage["stage"]))
+            if before:
+                print(f"  {run['rows']:>9} {stage['stage']:<45} {before:9.3f}s → {stage['seconds']:9.3f}s  "
+                      f"({stage['seconds'] / before:5.2f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark every cleaning stage on generated dirty data")
+    parser.add_argument("--rows", type=int, nargs="+", default=DEFAULT_ROWS,
+                        help="Dataset sizes to run, e.g. --rows 10000 1000000 10000000")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--formats", nargs="+", default=["csv"], choices=["csv", "xlsx"],
+                        help="Output formats to time in save_file")
+    parser.add_argument("--output", help="Where to write the JSON results")
+    parser.add_argument("--compare", metavar="OLD_JSON", help="Print stage timings against an earlier run")
+    args = parser.parse_args()
+
+    DATA_DIR.mkdir(exist_ok=True)
+    results = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "seed": args.seed,
+        },
+        "runs": [],
+    }
+
+    for rows in args.rows:
+        path = DATA_DIR / f"dirty_{rows}_seed{args.seed}.csv"
+        if not path.exists():
+            print(f"Generating {rows} rows → {path}")
+            generate_file(path, rows, seed=args.seed)
+        print(f"\nBenchmarking {rows} rows:")
+        results["runs"].append({"rows": rows, "stages": run_pipeline(path, args.formats)})
+
+    output = Path(args.output) if args.output else RESULTS_DIR / f"bench_{results['meta']['commit'] or 'nogit'}_{datetime.now():%Y%m%d_%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults saved to: {output}")
+
+    if args.compare:
+        compare(args.compare, results)
+
+
+if __name__ == "__main__":
+    main()
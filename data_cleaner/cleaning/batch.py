@@ -0,0 +1,122 @@
+import glob
+import io
+import json
+import sys
+import time
+from contextlib import redirect_stdout, nullcontext
+from pathlib import Path
+from colorama import Fore, Style
+from cleaning.io import MalformedCSVError
+from cleaning.parallel import resolve_workers
+
+# Batch mode: one invocation cleans every file of a directory, glob or manifest
+# (a text file with one path per line). Files are cleaned in a process pool,
+# each worker's console output is captured, and a failing file is recorded in
+# the summary instead of stopping the batch.
+
+BATCH_EXTENSIONS = [".csv", ".xlsx", ".xls", ".parquet", ".feather"]
+SUMMARY_FILE = "batch_summary.json"
+
+
+def expand_inputs(source):
+    path = Path(source)
+    if path.is_dir():
+        files = sorted(p for p in path.iterdir() if p.suffix.lower() in BATCH_EXTENSIONS)
+    elif path.is_file() and path.suffix.lower() not in BATCH_EXTENSIONS:
+        # Manifest: blank lines and # comments are skipped, relative paths
+        # are relative to the manifest
+        with open(path, encoding="utf-8") as f:
+            lines = [line.strip() for line in f]
+        files = [path.parent / line for line in lines if line and not line.startswith("#")]
+    elif path.is_file():
+        files = [path]
+    else:
+        files = sorted(Path(p) for p in glob.glob(source, recursive=True))
+        files = [p for p in files if p.suffix.lower() in BATCH_EXTENSIONS]
+
+    # Earlier outputs sitting next to their inputs are not inputs themselves
+    return [str(p) for p in files if not p.stem.endswith("_cleaned")]
+
+
+def batch_output_path(filepath, output_dir=None, output_format=None):
+    path = Path(filepath)
+    suffix = "." + output_format if output_format else path.suffix
+    return str(Path(output_dir or path.parent) / f"{path.stem}_cleaned{suffix}")
+
+
+def batch_outputs(files, output_dir=None, output_format=None):
+    outputs = [batch_output_path(f, output_dir, output_format) for f in files]
+    clashes = {out for out in outputs if outputs.count(out) > 1}
+    if clashes:
+        raise ValueError(f"Several inputs would be written to the same output: {sorted(clashes)}")
+    if output_dir:
+        Path(output_dir).mkdir(parents=True, exist_ok=True)
+    return outputs
+
+
+def clean_captured(clean, filepath, output_path, options, plan, capture=True):
+    # clean(filepath, output_path, options, plan) -> rows written
+    result = {"file": filepath, "output": output_path}
+    buffer = io.StringIO()
+    start = time.perf_counter()
+    try:
+        with redirect_stdout(buffer) if capture else nullcontext():
+            result["rows"] = clean(filepath, output_path, options, plan)
+        result["status"] = "ok"
+    except MalformedCSVError as e:
+        result["status"] = "malformed"
+        result["error"] = f"{len(e.bad_rows)} malformed row(s)"
+    except Exception as e:
+        result["status"] = "error"
+        result["error"] = f"{type(e).__name__}: {e}"
+    result["seconds"] = round(time.perf_counter() - start, 3)
+    result["log"] = buffer.getvalue()
+    return result
+
+
+def run_batch(files, outputs, clean, options, plan, workers=1, initializer=None, initargs=()):
+    # plan must already hold every decision: workers cannot prompt
+    workers = min(resolve_workers(workers), len(files))
+    print(f"\n{Fore.MAGENTA}📦 Cleaning {len(files)} file(s) with {workers} worker(s)...{Style.RESET_ALL}")
+    results = []
+    if workers <= 1:
+        if initializer is not None:
+            initializer(*initargs)
+        for filepath, output_path in zip(files, outputs):
+            results.append(clean_captured(clean, filepath, output_path, options, plan))
+            print_result(results[-1])
+    else:
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+        with ProcessPoolExecutor(max_workers=workers, initializer=initializer, initargs=initargs) as pool:
+            futures = [pool.submit(clean_captured, clean, f, out, options, plan) for f, out in zip(files, outputs)]
+            for future in as_completed(futures):
+                results.append(future.result())
+                print_result(results[-1])
+        # Summary in input order, whatever order the workers finished in
+        order = {f: i for i, f in enumerate(files)}
+        results.sort(key=lambda r: order[r["file"]])
+    return results
+
+
+def print_result(result):
+    if result["status"] == "ok":
+        rows = f"{result['rows']} rows, " if result["rows"] is not None else ""
+        print(f"{Fore.GREEN}✅ {result['file']} → {result['output']} ({rows}{result['seconds']:.2f}s){Style.RESET_ALL}")
+    else:
+        print(f"{Fore.RED}❌ {result['file']}: {result['error']}{Style.RESET_ALL}")
+        # The captured output of a failed file explains what went wrong
+        sys.stdout.write(result["log"])
+
+
+def write_batch_summary(results, path):
+    summary = [{key: value for key, value in r.items() if key != "log"} for r in results]
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2, ensure_ascii=False)
+
+
+def print_batch_summary(results):
+    failed = [r for r in results if r["status"] != "ok"]
+    color = Fore.GREEN if not failed else Fore.YELLOW
+    print(f"\n{color}📦 Batch done: {len(results) - len(failed)} cleaned, {len(failed)} failed.{Style.RESET_ALL}")
+    for r in failed:
+        print(f"  - {r['file']} ({r['status']}): {r['error']}")
@@ -0,0 +1,170 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+import pandas as pd
+from colorama import Fore, Style
+
+# On-disk cache of cleaning results for files that are re-cleaned often (daily
+# exports that only grow). Entries are small JSON files keyed by file path and
+# content hashes:
+#
+#   types     per file: row count, per-column digest, inferred type, confidence, date format
+#   dedupe    per file: the dedupe columns chosen for it
+#   choices   per file: conflict group (by row hashes) -> the row the user kept
+#   dates     per dayfirst flag: raw date string -> parsed ISO datetime (or None)
+#   fuzzy     per reference set: query -> best match (or None)
+#
+# Reads touch the entry's mtime, and writes evict the least recently used
+# entries once the directory grows past its size budget. Entries that change
+# on every call (the dates map) are kept in memory and written by flush_cache
+# once per cleaned file.
+
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "data_cleaner"
+DEFAULT_CACHE_MB = 256
+
+_options = None
+_stats = {"hits": 0, "misses": 0}
+_flush_hooks = []
+
+
+def enable_cache(directory=DEFAULT_CACHE_DIR, max_mb=DEFAULT_CACHE_MB):
+    global _options
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    _options = {"directory": directory, "max_bytes": int(max_mb * 1024 * 1024)}
+
+
+def cache_enabled():
+    return _options is not None
+
+
+def _entry_path(kind, key):
+    digest = hashlib.sha256(key.encode("utf-8")).hexdigest()[:32]
+    return _options["directory"] / f"{kind}-{digest}.json"
+
+
+def cache_get(kind, key):
+    if _options is None:
+        return None
+    path = _entry_path(kind, key)
+    try:
+        with open(path, encoding="utf-8") as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        _stats["misses"] += 1
+        return None
+    if entry.get("key") != key:
+        _stats["misses"] += 1
+        return None
+    os.utime(path)  # LRU: recently read entries are evicted last
+    _stats["hits"] += 1
+    return entry["value"]
+
+
+def cache_put(kind, key, value):
+    if _options is None:
+        return
+    path = _entry_path(kind, key)
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"key": key, "value": value}, f, ensure_ascii=False)
+    os.replace(tmp, path)
+    evict()
+
+
+def on_flush(func):
+    _flush_hooks.append(func)
+
+
+def flush_cache():
+    if _options is None:
+        return
+    for func in _flush_hooks:
+        func()
+
+
+def evict():
+    entries = []
+    for path in _options["directory"].glob("*.json"):
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= _options["max_bytes"]:
+            break
+        path.unlink(missing_ok=True)
+        total -= size
+
+
+def print_cache_summary():
+    if _options is None:
+        return
+    print(f"{Fore.CYAN}🗃️  Cache: {_stats['hits']} hit(s), {_stats['misses']} miss(es) in {_options['directory']}{Style.RESET_ALL}")
+
+# ---------- FINGERPRINTS ----------
+
+def row_hashes(series):
+    return pd.util.hash_pandas_object(series, index=False).to_numpy()
+
+
+def hashes_digest(hashes):
+    return hashlib.blake2b(hashes.tobytes(), digest_size=16).hexdigest()
+
+
+def values_digest(values):
+    return hashlib.blake2b("\x1f".join(map(str, values)).encode("utf-8"), digest_size=16).hexdigest()
+
+
+def source_key(df):
+    # load_file records where a frame came from; frames built in memory have no key
+    source = df.attrs.get("source_path")
+    return str(source) if source else None
+
+# ---------- INFERRED TYPES ----------
+
+def column_hashes(df):
+    # Row hashes per column: digests of the whole column and of the rows an
+    # earlier run saw both come from one hashing pass
+    return {col: row_hashes(df[col]) for col in df.columns}
+
+
+def cached_column_types(df, hashes):
+    # Columns whose first rows are unchanged since the cached run:
+    # {col: (type, confidence, rows)} and their date formats
+    key = source_key(df)
+    entry = cache_get("types", key) if key else None
+    if not entry or len(df) < entry["rows"]:
+        return {}, {}
+
+    rows = entry["rows"]
+    known, date_formats = {}, {}
+    for col, info in entry["columns"].items():
+        if col not in df.columns:
+            continue
+        if hashes_digest(hashes[col][:rows]) == info["digest"]:
+            known[col] = (info["type"], info["confidence"], rows)
+            if info["date_format"]:
+                date_formats[col] = info["date_format"]
+    return known, date_formats
+
+
+def store_column_types(df, hashes, inferred_types, confidences, date_formats):
+    key = source_key(df)
+    if not key:
+        return
+    cache_put("types", key, {
+        "rows": len(df),
+        "columns": {
+            col: {
+                "digest": hashes_digest(hashes[col]),
+                "type": inferred_types[col],
+                "confidence": confidences[col],
+                "date_format": date_formats.get(col),
+            }
+            for col in inferred_types
+        },
+    })
@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 import re
 from colorama import Fore, Style
@@ -7,6 +8,10 @@ from cleaning.prompts import (
     ask_columns,
     select_row_to_keep
 )
+from cleaning.report import add_section, more_hint, null_statistics, print_null_report, PREVIEW_ROWS
+from cleaning.engine import duplicated_mask
+from cleaning.near_duplicates import find_near_duplicates, NEAR_DUPLICATE_THRESHOLD
+from cleaning.cache import cache_enabled, cache_get, cache_put, source_key, values_digest
 
 # ---------- HEADER CLEANING ----------
 
@@ -41,15 +46,19 @@ def check_and_fix_headers(df):
         df.columns = ask_custom_headers(len(df.columns))
         return df
 
-def check_and_fix_headers(df):
-    print(f"\n{Fore.CYAN}Checking headers...{Style.RESET_ALL}")
-
-    # Step 1: Drop any column where the header is blank or unnamed AND all values are null
+def find_empty_columns(df):
     cols_to_drop = []
     for col in df.columns:
         header_str = str(col).strip().lower()
         if (header_str == "" or header_str.startswith("unnamed")) and df[col].isnull().all():
             cols_to_drop.append(col)
+    return cols_to_drop
+
+def ask_and_fix_headers(df):
+    print(f"\n{Fore.CYAN}Checking headers...{Style.RESET_ALL}")
+
+    # Step 1: Drop any column where the header is blank or unnamed AND all values are null
+    cols_to_drop = find_empty_columns(df)
 
     if cols_to_drop:
         print(f"{Fore.YELLOW}⚠️ Dropping {len(cols_to_drop)} fully empty columns: {cols_to_drop}{Style.RESET_ALL}")
@@ -102,71 +111,235 @@ def check_and_fix_headers(df):
     df.columns = ask_custom_headers(len(df.columns))
     return df
 
+def apply_header_plan(df, header_plan):
+    keep_positions = header_plan["keep_positions"]
+    if max(keep_positions, default=-1) >= len(df.columns) or len(keep_positions) != len(header_plan["columns"]):
+        raise ValueError(f"Cleaning plan expects headers {header_plan['columns']}, file has {list(df.columns)}")
+    # The positions only mean the same columns under the same header; a header
+    # line that was data has nothing to compare but its width
+    source_columns = header_plan.get("source_columns")
+    if source_columns is not None:
+        found = [str(c) for c in df.columns]
+        if header_plan["header_is_data"]:
+            same = len(found) == len(source_columns)
+        else:
+            same = found == source_columns
+        if not same:
+            raise ValueError(f"Cleaning plan was made for headers {source_columns}, file has {found}")
+
+    df = df.iloc[:, keep_positions]
+    if header_plan["header_is_data"]:
+        df = push_headers_to_row(df)
+    df.columns = header_plan["columns"]
+    return df
+
+def check_and_fix_headers(df, plan=None):
+    if plan is not None and "headers" in plan:
+        print(f"\n{Fore.CYAN}Applying headers from cleaning plan...{Style.RESET_ALL}")
+        return apply_header_plan(df, plan["headers"])
+
+    original_columns = list(df.columns)
+    original_rows = len(df)
+    dropped = find_empty_columns(df)
+
+    df = ask_and_fix_headers(df)
+
+    if plan is not None:
+        plan["headers"] = {
+            "source_columns": [str(c) for c in original_columns],
+            "keep_positions": [i for i, c in enumerate(original_columns) if c not in dropped],
+            # Headers were pushed down into the data, so the header line is a row
+            "header_is_data": len(df) > original_rows,
+            "columns": [str(c) for c in df.columns],
+        }
+    return df
+
 # ---------- DUPLICATE HANDLING ----------
 
-def handle_duplicates_by_column(df):
-    if not ask_yes_no("Is there a unique column (or set of columns) to identify duplicates?"):
-        return df
+KEEP_POLICIES = ["ask", "first", "last", "most_complete", "newest"]
 
-    columns = ask_columns(df.columns)
-    if not columns:
-        return df
+def _rows_to_keep(conflicts, columns, keep, newest_by=None):
+    if keep in ["first", "last"]:
+        return conflicts.drop_duplicates(subset=columns, keep=keep).index
+
+    if keep == "most_complete":
+        score = conflicts.notna().sum(axis=1)
+    elif keep == "newest":
+        if newest_by not in conflicts.columns:
+            raise ValueError(f"Keep policy 'newest' needs a valid column, got: {newest_by}")
+        score = conflicts[newest_by]
+        if not pd.api.types.is_numeric_dtype(score):
+            score = pd.to_datetime(score, errors="coerce", dayfirst=True, format="mixed")
+    else:
+        raise ValueError(f"Unknown keep policy: {keep}")
 
-    dupes = df[df.duplicated(subset=columns, keep=False)]
+    # Stable sort so ties fall back to the first occurrence
+    ranked = conflicts.loc[score.sort_values(ascending=False, kind="stable", na_position="last").index]
+    return ranked.drop_duplicates(subset=columns, keep="first").index
 
-    if dupes.empty:
+def ask_dedupe_columns(columns, keep="ask", newest_by=None, plan=None, source=None):
+    if plan is not None and "dedupe" in plan:
+        dedupe = plan["dedupe"]
+        return dedupe["columns"], dedupe.get("keep", "first"), dedupe.get("newest_by")
+
+    cached = cache_get("dedupe", source) if source else None
+    if cached is not None and set(cached) <= set(columns):
+        print(f"{Fore.CYAN}🗃️  Using the dedupe columns chosen for this file before: {cached or 'none'}{Style.RESET_ALL}")
+        columns = cached
+    else:
+        columns = ask_yes_no("Is there a unique column (or set of columns) to identify duplicates?") and ask_columns(columns)
+        columns = list(columns) if columns else []
+        if source:
+            cache_put("dedupe", source, columns)
+
+    if plan is not None:
+        # Per-group row choices cannot be replayed, so unattended runs keep the first row
+        plan["dedupe"] = {"columns": columns, "keep": "first" if keep == "ask" else keep, "newest_by": newest_by}
+    return columns, keep, newest_by
+
+def _ask_rows_to_drop(conflicts, groups, title="Duplicate key found, but rows differ"):
+    # groups: {key: row positions in conflicts}; the user picks one row per group
+    to_drop = []
+    # Rows chosen for the exact same conflicting rows of this file on earlier runs are reused
+    source = source_key(conflicts)
+    row_hashes = pd.util.hash_pandas_object(conflicts, index=False) if cache_enabled() and source else None
+    choices = (cache_get("choices", source) or {}) if row_hashes is not None else {}
+    reused = 0
+    for positions in groups.values():
+        match = conflicts.iloc[positions]
+        group_key = values_digest(sorted(row_hashes.iloc[positions])) if row_hashes is not None else None
+        kept_hash = choices.get(group_key)
+        if kept_hash is not None and kept_hash in set(row_hashes.iloc[positions]):
+            to_keep = match.index[row_hashes.iloc[positions].to_numpy() == kept_hash][0]
+            reused += 1
+        else:
+            print(f"\n{Fore.RED}⚠️ {title}:{Style.RESET_ALL}")
+            to_keep = select_row_to_keep(match)
+            if to_keep is None:
+                # Prompt cancelled: keep every row of the group
+                print(f"{Fore.CYAN}→ No row chosen; keeping all {len(match)} rows.{Style.RESET_ALL}")
+                continue
+            if group_key is not None:
+                choices[group_key] = int(row_hashes[to_keep])
+        to_drop.extend(match.index.difference([to_keep]))
+    if row_hashes is not None:
+        if reused:
+            print(f"{Fore.CYAN}🗃️  Reused {reused} earlier choice(s) for identical duplicate groups.{Style.RESET_ALL}")
+        cache_put("choices", source, choices)
+    return to_drop
+
+def drop_exact_duplicates(df, columns, keep="ask", newest_by=None):
+    dupe_mask = duplicated_mask(df, columns)
+
+    if not dupe_mask.any():
         print(f"{Fore.GREEN}✅ No duplicates found based on selected column(s).{Style.RESET_ALL}")
         return df
 
-    print(f"{Fore.YELLOW}⚠️ Found {len(dupes)} potential duplicates:{Style.RESET_ALL}")
-    skip_indices = set()
+    print(f"{Fore.YELLOW}⚠️ Found {int(dupe_mask.sum())} potential duplicates:{Style.RESET_ALL}")
 
-    for idx, row in dupes.iterrows():
-        if idx in skip_indices:
-            continue
+    # Step 1: Collapse fully identical rows in one vectorized pass
+    df = df[~duplicated_mask(df, keep="first")]
 
-        match = df[df[columns].eq(row[columns].values).all(axis=1)]
+    # Step 2: Whatever still shares a key differs somewhere in the row
+    conflicts = df[duplicated_mask(df, columns)]
+    if conflicts.empty:
+        print(f"{Fore.GREEN}✅ Duplicate handling complete.{Style.RESET_ALL}")
+        return df.reset_index(drop=True)
 
-        if len(match.drop_duplicates()) == 1:
-            df.drop(match.index[1:], inplace=True)
-            skip_indices.update(match.index)
-        else:
-            print(f"\n{Fore.RED}⚠️ Duplicate key found, but rows differ:{Style.RESET_ALL}")
-            to_keep = select_row_to_keep(match)
-            to_drop = match.index.difference([to_keep])
-            df.drop(index=to_drop, inplace=True)
-            skip_indices.update(match.index)
+    groups = conflicts.groupby(columns, sort=False, dropna=False).indices
+    print(f"{Fore.YELLOW}⚠️ {len(groups)} duplicate key(s) have rows that differ.{Style.RESET_ALL}")
+
+    if keep == "ask":
+        to_drop = _ask_rows_to_drop(conflicts, groups)
+    else:
+        print(f"{Fore.CYAN}→ Resolving with keep policy: {keep}{Style.RESET_ALL}")
+        to_drop = conflicts.index.difference(_rows_to_keep(conflicts, columns, keep, newest_by))
+
+    df = df.drop(index=to_drop)
 
     print(f"{Fore.GREEN}✅ Duplicate handling complete.{Style.RESET_ALL}")
     return df.reset_index(drop=True)
 
+def drop_near_duplicates(df, columns, keep="ask", newest_by=None, threshold=NEAR_DUPLICATE_THRESHOLD):
+    # Rows whose keys only differ by casing, spacing, punctuation or typos
+    groups = find_near_duplicates(df, columns, threshold)
+    if not groups:
+        print(f"{Fore.GREEN}✅ No near-duplicates found (similarity >= {threshold}).{Style.RESET_ALL}")
+        return df
+
+    print(f"{Fore.YELLOW}⚠️ Found {len(groups)} group(s) of near-duplicate keys (similarity >= {threshold}):{Style.RESET_ALL}")
+    for positions in groups[:PREVIEW_ROWS]:
+        keys = [repr(" / ".join(map(str, key))) for key in df.iloc[positions[:5]][columns].itertuples(index=False)]
+        print("  - " + " ≈ ".join(keys) + (f" (+{len(positions) - 5} more)" if len(positions) > 5 else ""))
+    if len(groups) > PREVIEW_ROWS:
+        print(more_hint(len(groups) - PREVIEW_ROWS, "groups"))
+
+    rows = np.concatenate(groups)
+    labels = np.repeat(np.arange(len(groups)), [len(positions) for positions in groups])
+    conflicts = df.iloc[rows]
+    add_section("near_duplicates", conflicts.assign(group=labels).reset_index(names="row"))
+
+    if keep == "ask":
+        offsets = np.cumsum([0] + [len(positions) for positions in groups])
+        to_drop = _ask_rows_to_drop(conflicts, {i: np.arange(offsets[i], offsets[i + 1]) for i in range(len(groups))},
+                                    "Near-duplicate keys found")
+    else:
+        print(f"{Fore.CYAN}→ Resolving with keep policy: {keep}{Style.RESET_ALL}")
+        # Rows of one group share a label, which then plays the duplicate key
+        labeled = conflicts.assign(_near_duplicate_group=labels).sort_index()
+        to_drop = labeled.index.difference(_rows_to_keep(labeled, ["_near_duplicate_group"], keep, newest_by))
+
+    df = df.drop(index=to_drop)
+
+    print(f"{Fore.GREEN}✅ Near-duplicate handling complete.{Style.RESET_ALL}")
+    return df.reset_index(drop=True)
+
+def handle_duplicates_by_column(df, keep="ask", newest_by=None, plan=None, fuzzy=None):
+    # fuzzy: similarity threshold (0-100) for near-duplicate keys; None for exact matches only
+    columns, keep, newest_by = ask_dedupe_columns(df.columns, keep, newest_by, plan, source_key(df))
+    if not columns:
+        return df
+    if plan is not None:
+        # A threshold given on the command line wins over the plan's
+        recorded = plan["dedupe"].get("fuzzy")
+        if fuzzy is None:
+            fuzzy = recorded
+        elif recorded is not None and recorded != fuzzy:
+            print(f"{Fore.YELLOW}⚠️ --fuzzy-dedupe {fuzzy} overrides the plan's threshold {recorded}.{Style.RESET_ALL}")
+        if fuzzy is not None:
+            plan["dedupe"]["fuzzy"] = fuzzy
+
+    df = drop_exact_duplicates(df, columns, keep, newest_by)
+    if fuzzy is not None:
+        df = drop_near_duplicates(df, columns, keep, newest_by, fuzzy)
+    return df
+
 # ---------- NULL HANDLING ----------
 
-def handle_null_rows(df):
-    null_rows = df[df.isnull().any(axis=1)]
-    null_count = df.isnull().sum().sum()
+def handle_null_rows(df, plan=None):
+    stats = null_statistics(df)
+    null_rows = stats["null_rows"]
 
     if null_rows.empty:
         print(f"{Fore.GREEN}✅ No null values found.{Style.RESET_ALL}")
         return df
 
-    print(f"{Fore.YELLOW}⚠️ Found {null_count} null values in {len(null_rows)} rows.{Style.RESET_ALL}")
-    # Print rows with red-colored NaNs
-    for idx, row in null_rows.iterrows():
-        pretty = []
-        for val in row.values:
-            if pd.isna(val):
-                pretty.append(f"{Fore.RED}{Style.BRIGHT}NaN{Style.RESET_ALL}")
-            else:
-                pretty.append(str(val))
-        print(f"{idx}\t" + "\t".join(pretty))
-
-    if ask_yes_no("Would you like to delete all rows with null values?"):
+    print(f"{Fore.YELLOW}⚠️ Found {stats['null_count']} null values in {len(null_rows)} rows.{Style.RESET_ALL}")
+    print_null_report(df, stats)
+
+    if plan is not None and "nulls" in plan:
+        drop = plan["nulls"] == "drop"
+    else:
+        drop = ask_yes_no("Would you like to delete all rows with null values?")
+        if plan is not None:
+            plan["nulls"] = "drop" if drop else "highlight"
+
+    if drop:
         df = df.dropna().reset_index(drop=True)
         print(f"{Fore.GREEN}✅ Rows with nulls deleted.{Style.RESET_ALL}")
     else:
         print(f"{Fore.CYAN}These rows will be highlighted in the Excel output.{Style.RESET_ALL}")
-        df.attrs["highlight_nulls"] = null_rows.index.tolist()
+        df.attrs["highlight_nulls"] = null_rows.tolist()
 
     return df
 
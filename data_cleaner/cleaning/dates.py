@@ -0,0 +1,179 @@
+from datetime import datetime
+from functools import lru_cache
+import pandas as pd
+from dateutil import parser
+from cleaning.cache import cache_enabled, cache_get, cache_put, on_flush
+
+# Date normalization engine: every distinct string is parsed once and the
+# result is broadcast back to the rows with a vectorized map. The dominant
+# explicit format is tried first with pd.to_datetime; only the leftovers go
+# through fuzzy dateutil, whose results are kept in a bounded cache.
+DATE_CACHE_SIZE = 100_000
+FORMAT_SAMPLE_SIZE = 200
+FORMAT_MIN_SHARE = 0.5
+VERIFY_SAMPLE_SIZE = 50
+
+# On-disk date maps of this run, {dayfirst key: {text: ISO datetime or None}},
+# in least-to-most recently used order; written once per file by save_date_cache
+_disk_dates = {}
+_changed = set()
+
+# Only formats that dateutil reads the same way for the given dayfirst setting
+# (with dayfirst=True dateutil reads "2024-06-01" as the 6th of January).
+DAYFIRST_FORMATS = [
+    "%d/%m/%Y", "%d-%m-%Y", "%d.%m.%Y",
+    "%d/%m/%y", "%d-%m-%y", "%d.%m.%y",
+    "%d %b %Y", "%d %B %Y",
+]
+MONTHFIRST_FORMATS = [
+    "%Y-%m-%d", "%Y/%m/%d",
+    "%m/%d/%Y", "%m-%d-%Y", "%m.%d.%Y",
+    "%m/%d/%y", "%m-%d-%y", "%m.%d.%y",
+    "%d %b %Y", "%d %B %Y",
+]
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def parse_with_dateutil(text, dayfirst=False):
+    try:
+        return parser.parse(text, dayfirst=dayfirst, fuzzy=True)
+    except Exception:
+        return None
+
+
+def date_cache_info():
+    return parse_with_dateutil.cache_info()
+
+
+def detect_date_format(values, dayfirst=False):
+    sample = values[:FORMAT_SAMPLE_SIZE]
+    if len(sample) == 0:
+        return None
+
+    best_format, best_share = None, 0.0
+    for fmt in (DAYFIRST_FORMATS if dayfirst else MONTHFIRST_FORMATS):
+        share = pd.to_datetime(pd.Series(sample), format=fmt, errors="coerce").notna().mean()
+        if share > best_share:
+            best_format, best_share = fmt, share
+    return best_format if best_share >= FORMAT_MIN_SHARE else None
+
+
+def _fast_parse(uniques, fmt, dayfirst):
+    parsed = pd.to_datetime(pd.Series(uniques, index=uniques), format=fmt, errors="coerce")
+
+    # dateutil keeps two-digit years within 50 years of today, pandas pivots at 69
+    if "%y" in fmt:
+        this_year = datetime.now().year
+        outside = (parsed.dt.year < this_year - 50) | (parsed.dt.year >= this_year + 50)
+        parsed[outside] = pd.NaT
+
+    # Safety net: the fast path must agree with what dateutil would have returned
+    hits = parsed.dropna()
+    for text, value in hits.head(VERIFY_SAMPLE_SIZE).items():
+        expected = parse_with_dateutil(text, dayfirst)
+        if expected is None or expected.tzinfo is not None or pd.Timestamp(expected) != value:
+            return pd.Series(pd.NaT, index=uniques)
+    return parsed
+
+
+def parse_unique_dates(series, dayfirst=False):
+    uniques = pd.unique(series.dropna().astype(str))
+    if len(uniques) == 0:
+        return {}
+
+    if cache_enabled():
+        return _parse_with_disk_cache(uniques, dayfirst)
+    return _parse_uniques(uniques, dayfirst)[0]
+
+
+def _uses_default_date(text, dayfirst):
+    # dateutil fills fields the text lacks ("March 5" has no year) from today,
+    # so such a result would go stale in the cache
+    try:
+        first = parser.parse(text, dayfirst=dayfirst, fuzzy=True, default=datetime(2000, 1, 1))
+        second = parser.parse(text, dayfirst=dayfirst, fuzzy=True, default=datetime(2001, 2, 2))
+    except Exception:
+        return False
+    return first != second
+
+
+def _date_map(key):
+    if key not in _disk_dates:
+        _disk_dates[key] = cache_get("dates", key) or {}
+    return _disk_dates[key]
+
+
+def _parse_with_disk_cache(uniques, dayfirst):
+    # Strings seen on earlier runs (None = unparseable) skip parsing entirely
+    key = f"dayfirst={dayfirst}"
+    known = _date_map(key)
+    parsed, new = {}, []
+    for text in uniques:
+        if text in known:
+            # Move to the most recently used end
+            value = known[text] = known.pop(text)
+            if value:
+                parsed[text] = datetime.fromisoformat(value)
+        else:
+            new.append(text)
+    _changed.add(key)
+    if not new:
+        return parsed
+
+    fresh, fuzzy = _parse_uniques(new, dayfirst)
+    parsed.update(fresh)
+    for text in new:
+        if text in fuzzy and text in fresh and _uses_default_date(text, dayfirst):
+            continue
+        known[text] = fresh[text].isoformat() if text in fresh else None
+    return parsed
+
+
+def save_date_cache():
+    # Merged into what is on disk, so column workers and the parent process
+    # (or parallel batch files) add to each other's entries
+    for key in _changed:
+        merged = cache_get("dates", key) or {}
+        for text, value in _disk_dates[key].items():
+            merged.pop(text, None)
+            merged[text] = value
+        # Least recently used strings go first once the map is full
+        cache_put("dates", key, dict(list(merged.items())[-DATE_CACHE_SIZE:]))
+    _changed.clear()
+
+
+on_flush(save_date_cache)
+
+
+def _parse_uniques(uniques, dayfirst):
+    # Parsed values, and the strings that needed fuzzy dateutil
+    parsed = {}
+    fmt = detect_date_format(uniques, dayfirst)
+    leftovers = uniques
+    if fmt:
+        fast = _fast_parse(uniques, fmt, dayfirst)
+        parsed = {text: value.to_pydatetime() for text, value in fast.dropna().items()}
+        leftovers = fast.index[fast.isna()]
+
+    for text in leftovers:
+        value = parse_with_dateutil(text, dayfirst)
+        if value is not None:
+            parsed[text] = value
+    return parsed, set(leftovers)
+
+
+def parse_dates(series, dayfirst=False):
+    # Equivalent of applying dateutil per cell: unparseable cells become NaT
+    parsed = parse_unique_dates(series, dayfirst)
+    result = series.astype(str).map(parsed).astype(object)
+    return result.where(result.notna() & series.notna(), pd.NaT).infer_objects()
+
+
+def format_dates(series, date_format, dayfirst=False):
+    # Unparseable cells keep their original value, nulls stay null
+    parsed = parse_unique_dates(series, dayfirst)
+    formatted = {text: value.strftime(date_format) for text, value in parsed.items()}
+    texts = series.astype(str)
+    result = texts.map(formatted)
+    keep_original = result.isna() | series.isna()
+    return result.astype(object).where(~keep_original, series)
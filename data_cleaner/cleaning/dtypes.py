@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+from colorama import Fore, Style
+
+# Memory-compact dtypes for the in-memory pipeline. After inference most columns
+# hold one Python string per row; repeated values become pandas categories
+# (codes + one copy of each distinct value), integers are downcast, True/False
+# columns become nullable booleans and remaining strings move to Arrow storage
+# where pandas has it. Floats stay float64: a float32 that holds the value
+# exactly still prints differently (2e+07 for 20000000.0). Normalizers then
+# run once per category through apply_by_category instead of once per row.
+
+# A string column becomes a category when at most this share of its values is distinct
+CATEGORY_RATIO = 0.5
+
+
+def memory_mb(df):
+    return df.memory_usage(deep=True).sum() / 1024 / 1024
+
+
+def arrow_string_dtype():
+    # pandas' NaN-semantics Arrow string dtype ("str" on pandas >= 3), if any
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return None
+    dtype = pd.Series([""], dtype="str").dtype
+    return dtype if getattr(dtype, "storage", None) == "pyarrow" else None
+
+
+def compact_series(series, category_ratio=CATEGORY_RATIO, string_dtype=None):
+    dtype = series.dtype
+    if isinstance(dtype, pd.CategoricalDtype) or pd.api.types.is_bool_dtype(dtype):
+        return series
+    if pd.api.types.is_integer_dtype(dtype):
+        return pd.to_numeric(series, downcast="integer")
+    if not (pd.api.types.is_object_dtype(dtype) or pd.api.types.is_string_dtype(dtype)):
+        return series
+
+    values = series.dropna()
+    if values.empty:
+        return series
+    if pd.api.types.is_object_dtype(dtype) and values.map(type).isin([bool, np.bool_]).all():
+        return series.astype("boolean")
+    if values.nunique() <= len(values) * category_ratio:
+        return series.astype("category")
+    if string_dtype is not None and pd.api.types.is_object_dtype(dtype) and values.map(type).eq(str).all():
+        return series.astype(string_dtype)
+    return series
+
+
+def compact_dtypes(df, category_ratio=CATEGORY_RATIO):
+    before = memory_mb(df)
+    string_dtype = arrow_string_dtype()
+    changed = {}
+    for col in df.columns:
+        compacted = compact_series(df[col], category_ratio, string_dtype)
+        if compacted.dtype != df[col].dtype:
+            changed[col] = f"{df[col].dtype} → {compacted.dtype}"
+            df[col] = compacted
+    after = memory_mb(df)
+
+    print(f"\n{Fore.CYAN}🗜️  Compacted {len(changed)} column(s): {before:.1f} MB → {after:.1f} MB in memory{Style.RESET_ALL}")
+    for col, change in changed.items():
+        print(f"  - {col}: {change}")
+    return df
+
+# ---------- PER-CATEGORY NORMALIZATION ----------
+
+def apply_by_category(series, func):
+    # func(series) -> series of the same length. Category columns run it on
+    # their categories only and rebuild the rows from the codes; the result
+    # stays a category when the normalized values are all strings and is
+    # compacted again otherwise (True/False → boolean, amounts → floats).
+    if not isinstance(series.dtype, pd.CategoricalDtype):
+        return func(series)
+
+    categories = pd.Series(series.cat.categories.to_numpy(dtype=object), name=series.name)
+    mapped = func(categories).to_numpy(dtype=object)
+    codes = series.cat.codes.to_numpy()
+
+    if all(isinstance(v, str) or pd.isna(v) for v in mapped):
+        new_codes, uniques = pd.factorize(mapped)
+        # Code -1 (null) picks the appended -1
+        codes = np.append(new_codes, -1)[codes]
+        return pd.Series(pd.Categorical.from_codes(codes, uniques), index=series.index, name=series.name)
+
+    values = np.append(mapped, np.nan)[codes]
+    return compact_series(pd.Series(values, index=series.index, name=series.name).infer_objects())
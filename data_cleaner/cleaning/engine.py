@@ -0,0 +1,181 @@
+import importlib.util
+import numpy as np
+import pandas as pd
+
+# Execution engine for the vectorizable steps. "pandas" is the default and runs
+# everything through pandas/numpy. "arrow" hands the columnar work to
+# pyarrow's multi-threaded kernels while the stages keep passing pandas frames
+# (Arrow-backed where possible) between each other:
+#
+#   load_file                CSV parsed by pyarrow.csv on all cores
+#   apply_column_types       whitespace trim and numeric coercion as Arrow kernels
+#   dedupe                   duplicate keys found by Arrow's hash group_by
+#   phone/currency/boolean   normalizer text stays Arrow-backed, so the .str
+#                            calls run as Arrow kernels that release the GIL
+#   normalization stage      columns run in threads instead of processes, so
+#                            --workers needs no pickling
+#
+# Anything Arrow cannot represent exactly (mixed-type object columns, CSV rows
+# pyarrow would parse differently) falls back to the pandas code path, so both
+# engines produce the same output.
+
+ENGINES = ["pandas", "arrow"]
+
+_engine = "pandas"
+
+
+def set_engine(name):
+    global _engine
+    if name not in ENGINES:
+        raise ValueError(f"Unknown engine: {name}")
+    if name == "arrow" and importlib.util.find_spec("pyarrow") is None:
+        raise ImportError("The arrow engine needs pyarrow (pip install pyarrow)")
+    _engine = name
+
+
+def arrow_engine():
+    return _engine == "arrow"
+
+# ---------- CSV INPUT ----------
+
+def read_csv_arrow(filepath, columns=None, csv_format=None):
+    # pyarrow.csv set up to read values the way pd.read_csv does: pandas' NA
+    # strings, True/False only (not 1/0) as booleans, and no date or time
+    # columns. Returns None when pandas has to parse the file instead:
+    #   - rows with the wrong number of fields (pandas pads short rows and
+    #     reports long ones by line number, which threaded pyarrow does not know)
+    #   - values with leading spaces (pandas skips them, including before an
+    #     opening quote)
+    #   - blank or repeated headers (pandas renames them "Unnamed: N" / "a.1")
+    #   - integers beyond int64 (pandas keeps them exact, pyarrow makes floats)
+    if not arrow_engine():
+        return None
+    import pyarrow as pa
+    import pyarrow.csv as pcsv
+    import pyarrow.compute as pc
+    from pandas._libs.parsers import STR_NA_VALUES
+
+    csv_format = csv_format or {"encoding": "utf-8", "sep": ","}
+    invalid = []
+
+    def on_invalid_row(row):
+        invalid.append(row)
+        return "skip"
+
+    def read(column_types=None):
+        return pcsv.read_csv(
+            filepath,
+            # pyarrow skips a UTF-8 BOM itself
+            read_options=pcsv.ReadOptions(encoding="utf8" if csv_format["encoding"] in ["utf-8", "utf-8-sig"] else csv_format["encoding"]),
+            parse_options=pcsv.ParseOptions(delimiter=csv_format["sep"], invalid_row_handler=on_invalid_row),
+            convert_options=pcsv.ConvertOptions(
+                include_columns=columns,
+                column_types=column_types,
+                null_values=sorted(STR_NA_VALUES),
+                strings_can_be_null=True,
+                true_values=["True", "TRUE", "true"],
+                false_values=["False", "FALSE", "false"],
+                timestamp_parsers=[],
+            ),
+        )
+
+    table = read()
+    if invalid:
+        return None
+    names = table.column_names
+    if "" in names or len(set(names)) < len(names):
+        return None
+    # pandas leaves dates and times as text for the date stage to parse
+    temporal = {field.name: pa.string() for field in table.schema if pa.types.is_temporal(field.type)}
+    if temporal:
+        table = read(temporal)
+
+    for column in table.columns:
+        if column.type == "string" and pc.any(pc.starts_with(column, " ")).as_py():
+            return None
+        if pa.types.is_floating(column.type) and column.null_count < len(column):
+            values = pc.drop_null(column)
+            integral = pc.equal(values, pc.round(values))
+            if pc.any(pc.and_(integral, pc.greater_equal(pc.abs(values), 2.0 ** 63))).as_py():
+                return None
+    return table.to_pandas()
+
+# ---------- COLUMN KERNELS ----------
+# pandas runs .str methods of Arrow-backed string columns as pyarrow.compute
+# kernels, so these keep the text in Arrow storage and let pandas dispatch.
+
+def is_arrow_string(series):
+    return pd.api.types.is_string_dtype(series.dtype) and getattr(series.dtype, "storage", None) == "pyarrow"
+
+
+def arrow_text(series):
+    # str(val) of every cell, Arrow-backed (Arrow string columns are used as they are)
+    from cleaning.dtypes import arrow_string_dtype
+
+    if is_arrow_string(series):
+        return series
+    dtype = arrow_string_dtype()
+    text = series.astype(object).astype(str)
+    return text.astype(dtype) if dtype is not None else text
+
+
+def trim_strings(series):
+    # str(x).strip() of every non-null cell; None when the column is not Arrow text
+    if not arrow_engine() or not is_arrow_string(series):
+        return None
+    return series.str.strip()
+
+
+def numeric_from_text(series):
+    # Whitespace removed, then parsed like pd.to_numeric(errors="coerce");
+    # None when the column is not Arrow text
+    if not arrow_engine() or not is_arrow_string(series):
+        return None
+    return pd.to_numeric(series.str.replace(r"\s+", "", regex=True), errors="coerce")
+
+# ---------- DUPLICATES ----------
+
+def _key_table(df, columns):
+    # One integer code column per key column (dictionary-encoded, nulls get a
+    # code of their own like pandas treats NaN keys as equal) plus row
+    # positions; None when a column cannot be compared exactly in Arrow
+    # (mixed Python types)
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    codes = {}
+    for i, col in enumerate(columns):
+        try:
+            array = pa.array(df[col], from_pandas=True)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            return None
+        if isinstance(array, pa.ChunkedArray):
+            array = array.combine_chunks()
+        if pa.types.is_dictionary(array.type):
+            array = array.dictionary_decode()
+        codes[f"key{i}"] = pc.dictionary_encode(array, null_encoding="encode").indices
+    codes["row"] = pa.array(np.arange(len(df)))
+    return pa.table(codes)
+
+
+def duplicated_mask(df, columns=None, keep=False):
+    # df.duplicated(subset=columns, keep=keep) for keep in (False, "first"). The
+    # arrow engine counts keys with Arrow's multi-threaded hash group_by and
+    # joins the repeated ones back to their rows.
+    import pyarrow.compute as pc
+
+    columns = list(df.columns) if columns is None else list(columns)
+    table = _key_table(df, columns) if arrow_engine() else None
+    if table is None:
+        return df.duplicated(subset=columns, keep=keep)
+
+    keys = [name for name in table.column_names if name != "row"]
+    counts = table.group_by(keys, use_threads=True).aggregate([("row", "min"), ("row", "count")])
+    repeated = counts.filter(pc.greater(counts["row_count"], 1))
+    rows = table.join(repeated, keys, join_type="inner", use_threads=True)["row"]
+
+    mask = np.zeros(len(df), dtype=bool)
+    mask[rows.to_numpy()] = True
+    if keep == "first":
+        mask[repeated["row_min"].to_numpy()] = False
+    return pd.Series(mask, index=df.index)
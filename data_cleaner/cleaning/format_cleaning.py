@@ -1,10 +1,26 @@
 import re
+import numpy as np
 import pandas as pd
 from colorama import Fore, Style
-from fuzzywuzzy import fuzz
 from collections import Counter
 from itertools import combinations
-from dateutil import parser
+from cleaning.dates import format_dates
+from cleaning.fuzzy_index import best_matches
+from cleaning.parallel import map_columns
+from cleaning.dtypes import apply_by_category
+from cleaning.report import add_section, preview_list, more_hint, PREVIEW_VALUES
+from cleaning.vectorized import (
+    normalize_phone_series,
+    normalize_currency_series,
+    normalize_boolean_series,
+    strip_series
+)
+
+# Every normalizer below is a pure function of the cell value, so by default it
+# runs once per distinct value (apply_per_value) rather than once per row.
+# Columns where more than this share of the values is distinct are normalized
+# row by row, since factorizing them first would only add a hashing pass.
+PER_VALUE_MAX_RATIO = 0.5
 
 
 def normalize_phone_number(val):
@@ -78,131 +94,156 @@ def normalize_boolean(val):
 
 
 
-def normalize_dates(series, desired_format="%d/%m/%Y"):
-    formats_found = Counter()
-    parsed_dates = []
+def normalize_dates(series, desired_format="%d/%m/%Y", verbose=True):
+    parsed_dates = format_dates(series, desired_format)
 
-    for val in series:
-        if pd.isna(val):
-            parsed_dates.append(val)
-            continue
-        try:
-            dt = parser.parse(str(val), fuzzy=True)
-            fmt = dt.strftime(desired_format)
-            parsed_dates.append(fmt)
-            formats_found[fmt] += 1
-        except:
-            parsed_dates.append(val)
+    if verbose:
+        print(f"{Fore.CYAN}\U0001F552 Date normalization complete using format: {desired_format}{Style.RESET_ALL}")
+    return parsed_dates
 
-    print(f"{Fore.CYAN}\U0001F552 Date normalization complete using format: {desired_format}{Style.RESET_ALL}")
-    return pd.Series(parsed_dates)
 
+def apply_per_value(series, func, max_ratio=PER_VALUE_MAX_RATIO):
+    # func(series) -> series of the same length. The column is factorized, func
+    # runs on the uniques and the rows are rebuilt from the codes.
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return apply_by_category(series, func)
+    # Factorizing treats 1, 1.0 and True as one value, but str() of them differs
+    if pd.api.types.is_object_dtype(series.dtype) and pd.api.types.infer_dtype(series, skipna=True).startswith("mixed"):
+        return func(series)
 
-def clean_and_preview_categoricals(df):
-    inferred = df.attrs.get("inferred_types", {})
-    if not inferred:
-        print(f"{Fore.RED}❌ No inferred types found. Please run inference.py first.{Style.RESET_ALL}")
-        return df
+    codes, uniques = pd.factorize(series)
+    if len(uniques) > len(series) * max_ratio:
+        return func(series)
 
-    print(f"\n{Fore.MAGENTA}🔎 Categorical Value Inspection & Auto-Correction...{Style.RESET_ALL}")
+    mapped = func(pd.Series(uniques, name=series.name)).to_numpy(dtype=object)
+    # Code -1 (null) picks the appended NaN
+    values = np.append(mapped, np.nan)[codes]
+    return pd.Series(values, index=series.index, name=series.name).infer_objects()
+
+
+def is_safe_for_title(val):
+    if pd.isna(val):
+        return False
+    val_str = str(val)
+    # Check for special characters or patterns that indicate we shouldn't apply .title()
+    if any(char in val_str for char in ['@', '/', '\\', '_']) or re.search(r"http|www|\.\w{2,}$", val_str, re.IGNORECASE):
+        return False
+    return True
 
-    for col in df.columns:
-        col_lower = col.lower()
-        print(f"{Fore.BLUE}→ Processing column: {col}{Style.RESET_ALL}")
 
-        inferred_type = inferred.get(col, "")
+def title_case(series):
+    return series.apply(lambda x: str(x).title() if is_safe_for_title(x) else x)
 
-        # Apply format-based normalizers first
-        if inferred_type == "phone":
-            df[col] = df[col].apply(normalize_phone_number)
-            continue
-        elif inferred_type == "currency":
+
+# Applies the format-based normalizer for one column.
+# Returns False when the column still needs categorical typo handling.
+def normalize_column_format(df, col, inferred_type, verbose=True):
+    if inferred_type == "phone":
+        df[col] = apply_per_value(df[col], normalize_phone_series)
+    elif inferred_type == "currency":
+        if verbose:
             print("Assuming all currency is constant")
-            df[col] = df[col].apply(normalize_currency)
-            continue
-        elif inferred_type == "boolean":
-            df[col] = df[col].apply(normalize_boolean)
-            continue
-        elif inferred_type == "text":
-            def is_safe_for_title(val):
-                if pd.isna(val):
-                    return False
-                val_str = str(val)
-        # Check for special characters or patterns that indicate we shouldn't apply .title()
-                if any(char in val_str for char in ['@', '/', '\\', '_']) or re.search(r"http|www|\.\w{2,}$", val_str, re.IGNORECASE):
-                    return False
-                return True
-
-            if not re.search(r"email|e-mail|mail|username|user_name|site|url|link", col, re.IGNORECASE):
-                df[col] = df[col].apply(lambda x: str(x).title() if is_safe_for_title(x) else x)
-            else:
-                df[col] = df[col].astype(str)
-
-        elif inferred_type == "postal":
-            df[col] = df[col].apply(lambda x: str(x).strip() if pd.notna(x) else x)
-            continue
-        elif inferred_type == "date":
-            df[col] = normalize_dates(df[col], desired_format="%d/%m/%Y")
-            continue
-
-        # Now handle categorical typo detection
-        if inferred_type != "categorical":
-            continue
-
-        print(f"\n{Fore.BLUE}→ Checking column: {col}{Style.RESET_ALL}")
-
-        # Step 1: Build original row-wise dictionary
-        check_dictionary = df[col].to_dict()
-
-        # Step 2: Lowercase and strip all values temporarily for cleaning
-        lowered_cleaned = {k: str(v).strip().lower() for k, v in check_dictionary.items() if pd.notna(v)}
-
-        # Step 3: Extract unique values matching text pattern
-        regex_pattern = re.compile(r"^[a-zA-Z\s]+$")
-        unique_cleaned = list({v for v in lowered_cleaned.values() if regex_pattern.match(v)})
-
-        print(f"{Fore.CYAN}🔍 Unique cleaned values (matching pattern):{Style.RESET_ALL}")
-        print(unique_cleaned)
-
-        # Step 4: Build frequency map to identify common values
-        cleaned_series = pd.Series(lowered_cleaned.values())
-        freq_map = Counter(cleaned_series)
-        common_values = [val for val, count in freq_map.items() if count > 1]
-
-        # Step 5: Fuzzy match rare values to common ones
-        typo_threshold = 85
-        correction_map = {}
-        for val in unique_cleaned:
-            if val in common_values:
-                continue
-
-            best_match = None
-            best_score = 0
-            for ref in common_values:
-                score = fuzz.ratio(val, ref)
-                if score >= typo_threshold and score > best_score:
-                    best_match = ref
-                    best_score = score
-
-            if best_match:
-                correction_map[val] = best_match
-
-        # Step 6: Apply correction and re-title
-        corrected = {}
-        for idx, val in lowered_cleaned.items():
-            fixed = correction_map.get(val, val)
-            corrected[idx] = fixed.title()
-
-        # Step 7: Restore values in original DataFrame based on row index
-        for idx, val in corrected.items():
-            df.at[idx, col] = val
-
-        if correction_map:
-            print(f"{Fore.YELLOW}⚠️ Auto-corrected fuzzy typos:{Style.RESET_ALL}")
-            for typo, correct in correction_map.items():
-                print(f"  - '{typo}' → '{correct}'")
+        df[col] = apply_per_value(df[col], normalize_currency_series)
+    elif inferred_type == "boolean":
+        df[col] = apply_per_value(df[col], normalize_boolean_series)
+    elif inferred_type == "text":
+        if not re.search(r"email|e-mail|mail|username|user_name|site|url|link", col, re.IGNORECASE):
+            df[col] = apply_per_value(df[col], title_case)
         else:
-            print(f"{Fore.GREEN}✅ No typos found to fix in column: {col}{Style.RESET_ALL}")
+            df[col] = df[col].astype(str)
+    elif inferred_type == "postal":
+        df[col] = apply_per_value(df[col], strip_series)
+    elif inferred_type == "date":
+        df[col] = apply_per_value(df[col], lambda s: normalize_dates(s, desired_format="%d/%m/%Y", verbose=verbose))
+    return inferred_type == "categorical"
+
+
+def build_correction_map(freq_map, typo_threshold=85):
+    # Extract unique values matching text pattern
+    regex_pattern = re.compile(r"^[a-zA-Z\s]+$")
+    unique_cleaned = [v for v in freq_map if regex_pattern.match(v)]
+
+    common_values = [val for val, count in freq_map.items() if count > 1]
+    common_set = set(common_values)
+
+    # Fuzzy match rare values to common ones, scoring only candidates whose
+    # length can still reach the threshold
+    rare_values = [val for val in unique_cleaned if val not in common_set]
+    return best_matches(rare_values, common_values, typo_threshold)
+
+
+def value_frequencies(series):
+    # Lowercased, stripped value -> count, in order of first appearance.
+    # Category columns are counted from their codes.
+    if not isinstance(series.dtype, pd.CategoricalDtype):
+        return Counter(series.dropna().astype(str).str.strip().str.lower())
+
+    codes = series.cat.codes.to_numpy()
+    codes = codes[codes >= 0]
+    counts = np.bincount(codes, minlength=len(series.cat.categories))
+    lowered = series.cat.categories.astype(str).str.strip().str.lower()
+    freq_map = Counter()
+    for code in pd.unique(codes):
+        freq_map[lowered[code]] += int(counts[code])
+    return freq_map
+
+
+def apply_correction_map(series, correction_map):
+    lowered = series.dropna().astype(str).str.strip().str.lower()
+    replacements = {v: correction_map.get(v, v).title() for v in lowered.unique()}
+    corrected = lowered.map(replacements)
+    result = series.astype(object).copy()
+    result.loc[corrected.index] = corrected
+    return result
+
+
+def print_corrections(col, correction_map, limit=PREVIEW_VALUES):
+    for typo, correct in list(correction_map.items())[:limit]:
+        print(f"  - '{typo}' → '{correct}'")
+    if len(correction_map) > limit:
+        print(more_hint(len(correction_map) - limit, "corrections"))
+    add_section("fuzzy_corrections", pd.DataFrame({"column": col, "value": list(correction_map), "corrected": list(correction_map.values())}))
+
+
+def clean_column(series, inferred_type):
+    col = series.name
+    print(f"{Fore.BLUE}→ Processing column: {col}{Style.RESET_ALL}")
+
+    # Apply format-based normalizers first, then handle categorical typo detection
+    frame = series.to_frame()
+    if not normalize_column_format(frame, col, inferred_type):
+        return frame[col]
+
+    print(f"\n{Fore.BLUE}→ Checking column: {col}{Style.RESET_ALL}")
+
+    # Step 1-2: Lowercase and strip all values temporarily, then count them
+    # to identify common values
+    freq_map = value_frequencies(series)
+
+    regex_pattern = re.compile(r"^[a-zA-Z\s]+$")
+    print(f"{Fore.CYAN}🔍 Unique cleaned values (matching pattern):{Style.RESET_ALL}")
+    preview_list([v for v in freq_map if regex_pattern.match(v)], "values")
+    add_section("categorical_values", pd.DataFrame({"column": col, "value": list(freq_map), "count": list(freq_map.values())}))
+
+    # Step 3: Fuzzy match rare values to common ones
+    correction_map = build_correction_map(freq_map)
+
+    if correction_map:
+        print(f"{Fore.YELLOW}⚠️ Auto-corrected fuzzy typos:{Style.RESET_ALL}")
+        print_corrections(col, correction_map)
+    else:
+        print(f"{Fore.GREEN}✅ No typos found to fix in column: {col}{Style.RESET_ALL}")
+
+    # Step 4: Apply correction, re-title and restore values in original DataFrame
+    return apply_per_value(series, lambda s: apply_correction_map(s, correction_map))
+
+
+def clean_and_preview_categoricals(df, workers=1):
+    inferred = df.attrs.get("inferred_types", {})
+    if not inferred:
+        print(f"{Fore.RED}❌ No inferred types found. Please run inference.py first.{Style.RESET_ALL}")
+        return df
 
-    return df
+    print(f"\n{Fore.MAGENTA}🔎 Categorical Value Inspection & Auto-Correction...{Style.RESET_ALL}")
 
+    return map_columns(df, clean_column, inferred, workers)
@@ -1,9 +1,17 @@
 import pandas as pd
 import re
 from colorama import Fore, Style
-from dateutil import parser
+from cleaning.dates import format_dates
+from cleaning.fuzzy_index import best_matches
+from cleaning.parallel import map_columns
+from cleaning.format_cleaning import apply_per_value
+from cleaning.vectorized import (
+    normalize_phone_series,
+    normalize_currency_series,
+    normalize_boolean_series,
+    strip_series
+)
 from collections import Counter
-from fuzzywuzzy import fuzz
 
 
 def normalize_phone_number(val):
@@ -42,94 +50,83 @@ def normalize_boolean(val):
 
 
 def normalize_dates(series, desired_format="%d/%m/%Y"):
-    formats_found = Counter()
-    parsed_dates = []
-
-    for val in series:
-        if pd.isna(val):
-            parsed_dates.append(val)
-            continue
-        try:
-            dt = parser.parse(str(val), fuzzy=True)
-            fmt = dt.strftime(desired_format)
-            parsed_dates.append(fmt)
-            formats_found[fmt] += 1
-        except:
-            parsed_dates.append(val)
+    parsed_dates = format_dates(series, desired_format)
 
     print(f"{Fore.CYAN}🕒 Date normalization complete using format: {desired_format}{Style.RESET_ALL}")
-    return pd.Series(parsed_dates)
+    return parsed_dates
 
 
-def get_canonical_casing(series, target):
-    match = series[series.str.lower().str.strip() == target]
-    return match.mode().iloc[0] if not match.empty else target.title()
+def build_canonical_casing(series, targets):
+    # One pass for the whole column: the most frequent original spelling of
+    # each target (ties go to the smallest value, as Series.mode does)
+    keys = series.str.lower().str.strip()
+    spellings = pd.DataFrame({"key": keys, "value": series}).dropna()
+    spellings = spellings[spellings["key"].isin(targets)]
+    counts = spellings.groupby(["key", "value"]).size().reset_index(name="count")
+    counts = counts.sort_values(["key", "count", "value"], ascending=[True, False, True])
+    canonical = dict(zip(*counts.drop_duplicates("key")[["key", "value"]].to_numpy().T)) if len(counts) else {}
+    return {target: canonical.get(target, target.title()) for target in targets}
 
-def normalize_categorical_column(series, threshold=90):
+def normalize_categorical_column(series, threshold=90, min_frequency=2):
     cleaned = series.copy()
     lowered = series.astype(str).str.lower().str.strip()
     freq_map = Counter(lowered)
-    common_values = [val for val, count in freq_map.items() if count > 1]
+    # Missing values stay NaN under pandas' string dtype; they are never a reference
+    common_values = [val for val, count in freq_map.items() if count >= min_frequency and isinstance(val, str)]
 
     print(f"\n🔍 Fuzzy Matching Debug for column '{series.name}':")
     print(f"Common values (used as reference): {common_values}\n")
 
-    for idx, val in series.items():
-        if pd.isna(val):
-            continue
+    canonical = build_canonical_casing(series, common_values)
 
-        val_norm = str(val).lower().strip()
+    # Score each distinct value once instead of every row
+    present = series.notna()
+    normalized = series[present].astype(str).str.lower().str.strip()
+    distinct = normalized.unique()
+    common_set = set(common_values)
+    fuzzy = best_matches([v for v in distinct if v not in common_set], common_values, threshold)
 
-        # Direct match with canonical
-        if val_norm in common_values:
-            cleaned.at[idx] = get_canonical_casing(series, val_norm)
-            continue
-
-        # Fuzzy match
-        best_match = None
-        best_score = 0
-        for target in common_values:
-            score = fuzz.ratio(val_norm, target)
-            if score > best_score and score >= threshold:
-                best_match = target
-                best_score = score
-
-        if best_match:
-            cleaned.at[idx] = get_canonical_casing(series, best_match)
+    replacements = {v: canonical[v] for v in distinct if v in common_set}
+    replacements.update({v: canonical[target] for v, target in fuzzy.items()})
 
+    fixed = normalized.map(replacements)
+    fixed = fixed[fixed.notna()]
+    cleaned = cleaned.astype(object)
+    cleaned.loc[fixed.index] = fixed
     return cleaned
 
 
-def normalize_column_formats(df):
-    print(f"\n{Fore.MAGENTA}🔧 Normalizing column formats...{Style.RESET_ALL}")
-    
-    inferred_types = df.attrs.get("inferred_types", {})
+def normalize_column(series, inferred_type, threshold=90, min_frequency=2):
+    print(f"{Fore.BLUE}→ Processing column: {series.name}{Style.RESET_ALL}")
 
-    for col in df.columns:
-        col_lower = col.lower()
-        print(f"{Fore.BLUE}→ Processing column: {col}{Style.RESET_ALL}")
+    if inferred_type == "phone":
+        return apply_per_value(series, lambda s: normalize_phone_series(s, flag_foreign=False))
 
-        inferred_type = inferred_types.get(col, "")
+    elif inferred_type == "currency":
+        print("Assuming all currency is constant")
+        return apply_per_value(series, lambda s: normalize_currency_series(s, multipliers=False))
 
-        if inferred_type == "phone":
-            df[col] = df[col].apply(normalize_phone_number)
+    elif inferred_type == "boolean":
+        return apply_per_value(series, lambda s: normalize_boolean_series(s, exact_values=False))
 
-        elif inferred_type == "currency":
-            print("Assuming all currency is constant")
-            df[col] = df[col].apply(normalize_currency)
+    elif inferred_type == "postal":
+        return apply_per_value(series, strip_series)
 
-        elif inferred_type == "boolean":
-            df[col] = df[col].apply(normalize_boolean)
+    elif inferred_type == "date":
+        return normalize_dates(series, desired_format="%d/%m/%Y")
 
-        elif inferred_type == "postal":
-            df[col] = df[col].apply(lambda x: str(x).strip() if pd.notna(x) else x)
+    elif inferred_type == "categorical":
+        return normalize_categorical_column(series, threshold, min_frequency)
 
-        elif inferred_type == "date":
-            df[col] = normalize_dates(df[col], desired_format="%d/%m/%Y")
+    return series
 
-        elif inferred_type == "categorical":
-            df[col] = normalize_categorical_column(df[col])
+
+def normalize_column_formats(df, threshold=90, min_frequency=2, workers=1):
+    print(f"\n{Fore.MAGENTA}🔧 Normalizing column formats...{Style.RESET_ALL}")
+    
+    inferred_types = df.attrs.get("inferred_types", {})
+    df = map_columns(df, normalize_column, inferred_types, workers,
+                     threshold=threshold, min_frequency=min_frequency)
 
     print(f"\n{Fore.GREEN}✅ Format normalization complete.{Style.RESET_ALL}")
     return df
-
@@ -0,0 +1,127 @@
+from collections import defaultdict
+import numpy as np
+from cleaning.cache import cache_enabled, cache_get, cache_put, values_digest
+
+# Candidate pruning for fuzzy typo correction. fuzz.ratio is
+# round(100 * (len1 + len2 - indel_distance) / (len1 + len2)), and the indel
+# distance is at least |len1 - len2|, so a reference whose length alone caps
+# the score below the threshold can never match and is never scored.
+
+# Queries x references scores are computed a block of queries at a time
+QUERY_BLOCK_ROWS = 4096
+SCORE_BLOCK_CELLS = 4 * 1024 * 1024
+
+
+def _load_cdist():
+    # Imported on the first match rather than at startup
+    try:
+        from rapidfuzz.process import cdist
+        from rapidfuzz.distance import Indel
+    except ImportError:  # rapidfuzz comes with python-Levenshtein >= 0.20
+        return None, None
+    return cdist, Indel.distance
+
+
+def _load_cpdist():
+    try:
+        from rapidfuzz.process import cpdist
+        from rapidfuzz.distance import Indel
+    except ImportError:
+        return None, None
+    return cpdist, Indel.distance
+
+
+def _ratio_from_distance(distance, lensum):
+    # Same float arithmetic as fuzzywuzzy on top of Levenshtein.ratio
+    # (1 - distance / lensum), so scores round identically at the .5 boundaries
+    return np.rint(100 * (1.0 - distance / lensum)).astype(int)
+
+
+def _max_possible_score(len1, len2):
+    lensum = len1 + len2
+    return int(round(100 * (1.0 - abs(len1 - len2) / lensum))) if lensum else 0
+
+
+def build_length_index(references):
+    by_length = defaultdict(list)
+    for order, ref in enumerate(references):
+        by_length[len(ref)].append(order)
+    return by_length
+
+
+def best_matches(queries, references, threshold=85):
+    # {query: best reference} for every query scoring >= threshold. Ties keep the
+    # reference that comes first in `references`, like the original nested loop.
+    references = list(references)
+    if not cache_enabled():
+        return _score_matches(queries, references, threshold)
+
+    # Results only depend on the reference list, so queries already scored
+    # against the same references on an earlier run (None = no match) are reused
+    key = f"{threshold}:{values_digest(references)}"
+    known = cache_get("fuzzy", key) or {}
+    new = [query for query in dict.fromkeys(queries) if query not in known]
+    if new:
+        matches = _score_matches(new, references, threshold)
+        known.update({query: matches.get(query) for query in new})
+        cache_put("fuzzy", key, known)
+    return {query: known[query] for query in dict.fromkeys(queries) if known[query] is not None}
+
+
+def _score_matches(queries, references, threshold):
+    cdist, indel_distance = _load_cdist()
+    by_length = build_length_index(references)
+
+    queries_by_length = defaultdict(list)
+    for query in queries:
+        queries_by_length[len(query)].append(query)
+
+    matches = {}
+    for query_len, group in queries_by_length.items():
+        candidates = sorted(
+            order
+            for ref_len, orders in by_length.items()
+            if _max_possible_score(query_len, ref_len) >= threshold
+            for order in orders
+        )
+        if not candidates:
+            continue
+        candidate_refs = [references[i] for i in candidates]
+        lensums = query_len + np.array([len(r) for r in candidate_refs])
+
+        # Only each query's best match is kept, so no block outlives its argmax
+        step = max(1, min(QUERY_BLOCK_ROWS, SCORE_BLOCK_CELLS // len(candidate_refs)))
+        for begin in range(0, len(group), step):
+            block = group[begin:begin + step]
+            if cdist is not None:
+                distances = cdist(block, candidate_refs, scorer=indel_distance, dtype=np.int32, workers=-1)
+                scores = _ratio_from_distance(distances, lensums)
+            else:
+                from fuzzywuzzy import fuzz
+                scores = np.array([[fuzz.ratio(q, r) for r in candidate_refs] for q in block])
+
+            best = scores.argmax(axis=1)
+            best_scores = scores[np.arange(len(block)), best]
+            for query, ref, score in zip(block, best, best_scores):
+                if score >= threshold:
+                    matches[query] = candidate_refs[ref]
+    return matches
+
+
+def pair_scores(left, right, lensums=None):
+    # fuzz.ratio(left[i], right[i]) for every i, scored element-wise in one
+    # call instead of a left x right matrix; lensums (len(left[i]) +
+    # len(right[i])) can be passed when the caller already has the lengths
+    left, right = list(left), list(right)
+    if not left:
+        return np.zeros(0, dtype=int)
+    cpdist, indel_distance = _load_cpdist()
+    if cpdist is None:
+        from fuzzywuzzy import fuzz
+        return np.array([fuzz.ratio(a, b) for a, b in zip(left, right)])
+
+    distances = cpdist(left, right, scorer=indel_distance, dtype=np.int32, workers=-1)
+    if lensums is None:
+        lensums = np.fromiter(map(len, left), int, len(left)) + np.fromiter(map(len, right), int, len(right))
+    # Two empty strings score 0, as in fuzzywuzzy
+    return np.where(lensums > 0, _ratio_from_distance(distances, np.maximum(lensums, 1)), 0)
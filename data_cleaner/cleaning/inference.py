@@ -1,52 +1,122 @@
 import pandas as pd
 import re
 from colorama import Fore, Style
-from dateutil import parser
-from ydata_profiling import ProfileReport
+from cleaning.dates import parse_with_dateutil, parse_dates, format_dates
 from cleaning.prompts import ask_date_format
-    
-def suggest_and_fix_column_types(df):
+from cleaning.format_cleaning import apply_per_value
+from cleaning.engine import trim_strings, numeric_from_text
+from cleaning.cache import cache_enabled, column_hashes, cached_column_types, store_column_types
+from cleaning.type_detection import (
+    detect_column_types_with_confidence,
+    stratified_positions,
+    SAMPLE_SIZE,
+    MIN_CONFIDENCE
+)
+
+INFERENCE_BACKENDS = ["native", "ydata"]
+
+def suggest_and_fix_column_types(df, plan=None, backend="native", sample_size=SAMPLE_SIZE,
+                                 min_confidence=MIN_CONFIDENCE):
+    if plan is not None and "column_types" in plan:
+        print(f"\n{Fore.CYAN}🔍 Applying column types from cleaning plan...{Style.RESET_ALL}")
+        return apply_column_types(df, plan["column_types"], plan.get("date_formats", {}))
+
+    if backend == "ydata":
+        df = suggest_with_ydata(df, sample_size)
+    elif backend == "native":
+        df = suggest_natively(df, plan.get("date_formats") if plan is not None else None,
+                              sample_size, min_confidence)
+    else:
+        raise ValueError(f"Unknown inference backend: {backend}")
+
+    if plan is not None:
+        plan["column_types"] = df.attrs["inferred_types"]
+        plan["date_formats"] = df.attrs["date_formats"]
+
+    return df
+
+
+def suggest_natively(df, known_date_formats=None, sample_size=SAMPLE_SIZE, min_confidence=MIN_CONFIDENCE):
+    print(f"\n{Fore.CYAN}🔍 Analyzing column types...{Style.RESET_ALL}")
+    known, cached_date_formats, hashes = {}, {}, None
+    if cache_enabled():
+        # Hash the raw columns before apply_column_types rewrites them
+        hashes = column_hashes(df)
+        known, cached_date_formats = cached_column_types(df, hashes)
+        if known:
+            print(f"{Fore.CYAN}🗃️  Reusing cached types for {len(known)} unchanged column(s); "
+                  f"only new rows are checked.{Style.RESET_ALL}")
+
+    inferred_types, confidences, escalated = detect_column_types_with_confidence(df, sample_size, min_confidence, known)
+    if escalated:
+        print(f"{Fore.CYAN}🔎 Sample of {sample_size} rows was not conclusive for {', '.join(map(str, escalated))}; "
+              f"checked all rows instead.{Style.RESET_ALL}")
+    known_date_formats = {**cached_date_formats, **(known_date_formats or {})}
+    date_formats = {}
+
+    for col, inferred_type in inferred_types.items():
+        if inferred_type == "date":
+            date_formats[col] = known_date_formats.get(col) or ask_date_format()
+
+        if inferred_type == "unknown":
+            print(f"{Fore.YELLOW}⚠️ Column '{col}' has unclear type. Leaving unchanged.{Style.RESET_ALL}")
+        else:
+            print(f"{Fore.GREEN}✅ Auto-detected '{col}' as {inferred_type} "
+                  f"(confidence {confidences[col]:.0%}){Style.RESET_ALL}")
+        if inferred_type == "currency":
+            print(f"{Fore.RED} !Assumed all values are of same currency ")
+
+    if hashes is not None:
+        store_column_types(df, hashes, inferred_types, confidences, date_formats)
+    df = apply_column_types(df, inferred_types, date_formats)
+    df.attrs["type_confidence"] = confidences
+    return df
+
+
+def _is_all_digits(series):
+    return series.dropna().astype(str).str.strip().str.replace(" ", "").str.isdigit().all()
+
+
+def suggest_with_ydata(df, sample_size=SAMPLE_SIZE):
+    # Optional backend: ydata-profiling is heavy, so only import it when asked for
+    from ydata_profiling import ProfileReport
+
     print(f"\n{Fore.CYAN}🔍 Analyzing column types with YData Profiling...{Style.RESET_ALL}")
+    # Heuristics and the profile run on a stratified sample of rows; only
+    # columns that look all-digit on the sample are confirmed on every row
+    sample_rows = df.iloc[stratified_positions(len(df), sample_size)]
     for col in df.columns:
-        if df[col].dropna().apply(lambda x: str(x).strip().replace(" ", "").isdigit()).all():
+        if _is_all_digits(sample_rows[col]) and _is_all_digits(df[col]):
             df[col] = df[col].apply(lambda x: re.sub(r"\D", "", str(x)) if pd.notna(x) else x)
             df[col] = pd.to_numeric(df[col], errors="coerce")
+    # Re-sample so the profile sees the converted columns
+    sample_rows = df.iloc[stratified_positions(len(df), sample_size)]
 
-    profile = ProfileReport(df, minimal=True, explorative=True, infer_dtypes=True)
+    profile = ProfileReport(sample_rows, minimal=True, explorative=True, infer_dtypes=True)
     desc = profile.get_description()
     variables = desc.variables
 
     inferred_types = {}
+    date_formats = {}
 
     for col in df.columns:
         dtype = str(df[col].dtype)
         semantic = variables.get(col, {}).get("semantic_type", [])
         suggested_type = variables.get(col, {}).get("type", "Unknown")
 
-        df[col] = df[col].apply(lambda x: str(x).strip() if pd.notnull(x) else x)
+        df[col] = apply_per_value(df[col], lambda s: s.apply(lambda x: str(x).strip() if pd.notnull(x) else x))
 
         # Semantic matching
         if "date" in str(semantic).lower() or re.search(r"date", col, re.IGNORECASE):
-            sample = df[col].dropna().astype(str).head(30)
-            parseable = 0
-            for val in sample:
-                try:
-                    parser.parse(val, dayfirst=True, fuzzy=True)
-                    parseable += 1
-                except:
-                    continue
+            sample = sample_rows[col].dropna().astype(str)
+            parseable = sum(parse_with_dateutil(val, True) is not None for val in sample)
 
             if parseable >= len(sample) * 0.8:
                 # Now apply full parse to column
                 date_format = ask_date_format()
-                def safe_parse_format(x):
-                    try:
-                        parsed=parser.parse(str(x), dayfirst=True, fuzzy=True)
-                        return parsed.strftime(date_format)
-                    except:
-                        return x
-                df[col] = df[col].apply(lambda x: safe_parse_format(x) if pd.notna(x) else x)
+                df[col] = format_dates(df[col], date_format, dayfirst=True)
                 inferred_types[col] = "date"
+                date_formats[col] = date_format
                 print(f"{Fore.GREEN}✅ Auto-detected '{col}' as datetime (semantic: date){Style.RESET_ALL}")
                 continue
         
@@ -68,7 +138,7 @@ def suggest_and_fix_column_types(df):
             continue
 
         # Custom rule: detect currency from column name or content
-        sample = df[col].dropna().astype(str).head(30)
+        sample = sample_rows[col].dropna().astype(str)
         currency_matches = sum(bool(re.search(r"[\$₹€]|USD|INR|Rs", val, re.IGNORECASE)) for val in sample)
 
         if currency_matches >= len(sample) * 0.6 or re.search(r"salary|price|amount|cost|currency", col, re.IGNORECASE):
@@ -86,19 +156,13 @@ def suggest_and_fix_column_types(df):
             print(f"{Fore.GREEN}✅ Auto-converted '{col}' to string based on fallback type ({suggested_type}){Style.RESET_ALL}")
         
         elif fallback in ["numeric", "integer", "float"]:
-            df[col] = df[col].apply(lambda x: re.sub(r"\s+", "", str(x)) if pd.notna(x) else x)
+            df[col] = apply_per_value(df[col], lambda s: s.apply(lambda x: re.sub(r"\s+", "", str(x)) if pd.notna(x) else x))
             df[col] = pd.to_numeric(df[col], errors="coerce")
             inferred_types[col] = "numeric"
             print(f"{Fore.GREEN}✅ Auto-converted '{col}' to numeric after stripping spaces based on fallback type ({suggested_type}){Style.RESET_ALL}")
 
         elif fallback == "datetime":
-            def try_parse(val):
-                try:
-                    return parser.parse(str(val), dayfirst=True, fuzzy=True)
-                except:
-                    return pd.NaT
-
-            df[col] = df[col].apply(try_parse)
+            df[col] = parse_dates(df[col], dayfirst=True)
             inferred_types[col] = "datetime"
             print(f"{Fore.GREEN}✅ Auto-converted '{col}' to datetime based on fallback type ({suggested_type}){Style.RESET_ALL}")
 
@@ -112,6 +176,42 @@ def suggest_and_fix_column_types(df):
 
     # ✅ Key line: attach inferred types to df
     df.attrs["inferred_types"] = inferred_types
+    df.attrs["date_formats"] = date_formats
+
+    return df
+
+
+# Replays the conversions decided by suggest_and_fix_column_types on a frame
+# with the same columns (used to clean a file chunk by chunk from a sample).
+def apply_column_types(df, inferred_types, date_formats=None):
+    date_formats = date_formats or {}
+    for col, inferred_type in inferred_types.items():
+        if col not in df.columns:
+            continue
+        trimmed = trim_strings(df[col])
+        if trimmed is not None:
+            df[col] = trimmed
+        else:
+            df[col] = apply_per_value(df[col], lambda s: s.apply(lambda x: str(x).strip() if pd.notnull(x) else x))
 
+        if inferred_type == "date" and col in date_formats:
+            df[col] = format_dates(df[col], date_formats[col], dayfirst=True)
+
+        elif inferred_type in ["text", "categorical"]:
+            df[col] = df[col].astype(str)
+
+        elif inferred_type == "numeric":
+            numbers = numeric_from_text(df[col])
+            if numbers is not None:
+                df[col] = numbers
+            else:
+                df[col] = apply_per_value(df[col], lambda s: s.apply(lambda x: re.sub(r"\s+", "", str(x)) if pd.notna(x) else x))
+                df[col] = pd.to_numeric(df[col], errors="coerce")
+
+        elif inferred_type == "datetime":
+            df[col] = parse_dates(df[col], dayfirst=True)
+
+    df.attrs["inferred_types"] = inferred_types
+    df.attrs["date_formats"] = date_formats
     return df
 
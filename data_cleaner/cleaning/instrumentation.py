@@ -0,0 +1,167 @@
+import json
+import os
+import re
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from colorama import Fore, Style
+from cleaning.dates import date_cache_info
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Per-stage instrumentation for --profile: wall time, rows/sec, memory delta and
+# date-cache hit rate for every pipeline stage and per-column normalizer.
+# Disabled by default, in which case profile_stage costs next to nothing.
+
+_options = None
+_records = []
+# Stage nesting is per thread: --engine arrow normalizes columns in threads
+_local = threading.local()
+
+
+def enable_profiling(cprofile_dir=None, trace_memory=False):
+    global _options
+    _options = {"cprofile_dir": cprofile_dir, "trace_memory": trace_memory}
+    # Forked workers call this too; records inherited from the parent are not theirs
+    _records.clear()
+    if cprofile_dir:
+        Path(cprofile_dir).mkdir(parents=True, exist_ok=True)
+    if trace_memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+
+def profiling_options():
+    return _options
+
+
+def current_depth():
+    return getattr(_local, "depth", 0)
+
+
+def _rss_mb():
+    try:
+        import psutil  # only loaded once profiling is on
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+    except ImportError:
+        pass
+    if resource is not None:
+        # Peak, not current, RSS: deltas only show growth of the high-water mark
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+    return None
+
+
+@contextmanager
+def profile_stage(name, rows=None, thread_depth=None):
+    # Yields a dict; callers may set "rows" once they know it. thread_depth:
+    # the stage runs in a worker thread, nested at that depth; memory and the
+    # date cache are shared by all threads, so it only records its time
+    record = {"stage": name, "rows": rows}
+    if _options is None:
+        yield record
+        return
+
+    depth = current_depth() if thread_depth is None else thread_depth
+    solo = thread_depth is None
+    profiler = None
+    if _options["cprofile_dir"] and depth == 0:
+        import cProfile
+        profiler = cProfile.Profile()
+    if _options["trace_memory"] and depth == 0:
+        tracemalloc.reset_peak()
+
+    cache_before = date_cache_info() if solo else None
+    rss_before = _rss_mb() if solo else None
+    _local.depth = depth + 1
+    start = time.perf_counter()
+    if profiler:
+        profiler.enable()
+    try:
+        yield record
+    finally:
+        if profiler:
+            profiler.disable()
+        seconds = time.perf_counter() - start
+        _local.depth = depth
+        rss_after = _rss_mb() if solo else None
+        cache_after = date_cache_info() if solo else None
+
+        hits = cache_after.hits - cache_before.hits if solo else None
+        misses = cache_after.misses - cache_before.misses if solo else None
+        record.update({
+            "start": start,
+            "seconds": seconds,
+            "depth": depth,
+            "pid": os.getpid(),
+            "rows_per_sec": round(record["rows"] / seconds) if record["rows"] and seconds else None,
+            "memory_delta_mb": round(rss_after - rss_before, 2) if rss_after is not None else None,
+            "date_cache_hits": hits,
+            "date_cache_misses": misses,
+            "date_cache_hit_rate": round(hits / (hits + misses), 3) if solo and hits + misses else None,
+        })
+        if _options["trace_memory"] and solo:
+            record["python_peak_mb"] = round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 2)
+        if profiler:
+            safe_name = re.sub(r"[^\w.-]+", "_", name)
+            record["cprofile"] = str(Path(_options["cprofile_dir"]) / f"{len(_records):02d}_{safe_name}.prof")
+            profiler.dump_stats(record["cprofile"])
+        _records.append(record)
+
+
+def run_stage(name, func, *args, **kwargs):
+    # Rows come from the input DataFrame, or from the result for loaders
+    rows = len(args[0]) if args and hasattr(args[0], "columns") else None
+    with profile_stage(name, rows) as record:
+        result = func(*args, **kwargs)
+        if record["rows"] is None and hasattr(result, "columns"):
+            record["rows"] = len(result)
+    return result
+
+
+def take_records():
+    records = _records[:]
+    _records.clear()
+    return records
+
+
+def add_records(records):
+    _records.extend(records)
+
+
+def print_profile_summary():
+    if not _records:
+        return
+    print(f"\n{Fore.MAGENTA}⏱️  Stage profile{Style.RESET_ALL}")
+    print(f"{'stage':<50} {'seconds':>9} {'rows/sec':>12} {'mem Δ MB':>9} {'date cache':>11}")
+    for record in sorted(_records, key=lambda r: r["start"]):
+        name = "  " * record["depth"] + record["stage"]
+        rate = f"{record['rows_per_sec']:,}" if record["rows_per_sec"] else "-"
+        memory = f"{record['memory_delta_mb']:+.1f}" if record["memory_delta_mb"] is not None else "-"
+        cache = f"{record['date_cache_hit_rate']:.0%}" if record["date_cache_hit_rate"] is not None else "-"
+        print(f"{name[:50]:<50} {record['seconds']:>9.3f} {rate:>12} {memory:>9} {cache:>11}")
+
+
+def write_trace(path):
+    # Chrome trace format (chrome://tracing, Perfetto); stats ride along in args
+    origin = min((r["start"] for r in _records), default=0)
+    events = []
+    for record in _records:
+        args = {k: v for k, v in record.items() if k not in ["stage", "start", "seconds", "pid", "depth"]}
+        events.append({
+            "name": record["stage"],
+            "ph": "X",
+            "ts": round((record["start"] - origin) * 1e6),
+            "dur": round(record["seconds"] * 1e6),
+            "pid": record["pid"],
+            "tid": record["pid"],
+            "args": args,
+        })
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f, indent=2)
+    print(f"{Fore.GREEN}⏱️  Profile trace saved to: {path}{Style.RESET_ALL}")
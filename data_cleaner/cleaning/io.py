@@ -1,58 +1,744 @@
 import pandas as pd
+import numpy as np
 from pathlib import Path
-from openpyxl import load_workbook
-from openpyxl.styles import PatternFill
+import codecs
 import csv
-import sys
+import importlib.util
+import json
+import mmap
+import os
+import re
+import warnings
+from collections import Counter
+from io import BufferedReader, RawIOBase, StringIO, TextIOWrapper
+from colorama import Fore, Style
+from cleaning.engine import read_csv_arrow
+from cleaning.parallel import resolve_workers
 
-def load_file(filepath):
+CSV_CHUNKSIZE = 100_000
+ROW_GROUP_SIZE = 100_000
+
+# Encoding and delimiter are sniffed from the start of the file
+SNIFF_BYTES = 64 * 1024
+CSV_DELIMITERS = ",;\t|"
+DEFAULT_CSV_FORMAT = {"encoding": "utf-8", "sep": ","}
+
+# Smaller CSVs parse faster in one pass than the pool takes to start
+PARALLEL_CSV_MIN_BYTES = 64 * 1024 * 1024
+BLANK_BYTES = b" \t\r\n"
+QUOTE_SCAN_BLOCK = 16 * 1024 * 1024
+
+COLUMNAR_FORMATS = {".parquet": "parquet", ".pq": "parquet", ".feather": "feather", ".arrow": "feather"}
+# df.attrs (inferred_types, date_formats...) travel in the schema metadata, except
+# source_path (a local hint for the cache, not part of the dataset) and
+# highlight_nulls (row positions, stale once the rows are cleaned again)
+ATTRS_METADATA_KEY = b"data_cleaner.attrs"
+UNSAVED_ATTRS = {"source_path", "highlight_nulls"}
+
+_BAD_LINE_RE = re.compile(r"Skipping line (\d+): expected (\d+) fields, saw (\d+)")
+_TRUNCATED_ROWS = "Length of header or names does not match length of data"
+
+
+class MalformedCSVError(ValueError):
+    def __init__(self, filepath, bad_rows):
+        self.filepath = filepath
+        self.bad_rows = bad_rows
+        super().__init__(f"{filepath}: {len(bad_rows)} malformed row(s)")
+
+
+def _column_hint(row):
+    # An unquoted "USD 80,000" splits into "USD 80" + "000": find the first
+    # field that looks like the tail of a number cut at a thousands separator.
+    for i in range(1, len(row)):
+        if re.fullmatch(r"\d{3}(\.\d+)?", row[i].strip()) and re.search(r"\d$", row[i - 1].strip()):
+            return f"Possible issue at column {i}"
+    return "Check currency columns"
+
+
+def _collect_bad_rows(caught):
+    # (bad rows, whether rows were cut without a line number): with
+    # index_col=False a first data row with extra fields makes the parser cut
+    # every such row to the header's width, with one warning for all of them
+    bad_rows = []
+    unplaced = False
+    for w in caught:
+        if not issubclass(w.category, pd.errors.ParserWarning):
+            warnings.warn_explicit(w.message, w.category, w.filename, w.lineno)
+            continue
+        unplaced = unplaced or str(w.message).startswith(_TRUNCATED_ROWS)
+        for m in _BAD_LINE_RE.finditer(str(w.message)):
+            bad_rows.append((int(m.group(1)), int(m.group(2)), int(m.group(3))))
+    return bad_rows, unplaced
+
+
+def report_malformed_rows(filepath, bad_rows, csv_format=DEFAULT_CSV_FORMAT):
+    # Only runs on the error path: re-read just the offending lines for the hint
+    wanted = {row_number for row_number, _, _ in bad_rows}
+    raw = {}
+    with open(filepath, newline='', encoding=csv_format["encoding"]) as f:
+        for line_number, line in enumerate(f, start=1):
+            if line_number in wanted:
+                raw[line_number] = next(csv.reader([line], delimiter=csv_format["sep"]), [])
+                if len(raw) == len(wanted):
+                    break
+
+    for row_number, expected_cols, found_cols in bad_rows:
+        col_hint = _column_hint(raw.get(row_number, []))
+        print(f"\n⚠️  Malformed CSV: Row {row_number} has {found_cols} columns but header has {expected_cols}.")
+        print(f"📍 {col_hint}")
+    print(f"💡 Tip: Check for unquoted currency values with commas")
+    print(f"📌 Fix: Wrap currency values in double quotes to preserve column structure.")
+
+
+def detect_csv_format(filepath):
+    # Read once per file so every reader (pandas, pyarrow, the parallel pieces)
+    # parses it the same way
+    with open(filepath, "rb") as f:
+        sample = f.read(SNIFF_BYTES)
+
+    if sample.startswith(codecs.BOM_UTF8):
+        encoding = "utf-8-sig"
+    elif sample.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        encoding = "utf-16"
+    else:
+        try:
+            sample.decode("utf-8")
+            encoding = "utf-8"
+        except UnicodeDecodeError as e:
+            # A character cut by the end of the sample is still UTF-8
+            truncated = e.reason == "unexpected end of data" and e.end == len(sample)
+            encoding = "utf-8" if truncated else "cp1252"
+        if encoding == "cp1252":
+            try:
+                sample.decode("cp1252")
+            except UnicodeDecodeError:
+                encoding = "latin-1"
+
+    lines = sample.decode(encoding, errors="ignore").splitlines()[:20]
+    try:
+        sep = csv.Sniffer().sniff("\n".join(lines), delimiters=CSV_DELIMITERS).delimiter
+    except csv.Error:
+        sep = ","
+    # A delimiter the header does not contain is a misreading of the data rows
+    if not lines or sep not in lines[0]:
+        sep = ","
+
+    csv_format = {"encoding": encoding, "sep": sep}
+    if csv_format != DEFAULT_CSV_FORMAT:
+        print(f"{Fore.CYAN}📄 Reading {Path(filepath).name} as {encoding} with {sep!r} as delimiter{Style.RESET_ALL}")
+    return csv_format
+
+
+def _mismatched_rows(lines, csv_format, width=None):
+    # Full csv-module scan, for when the parser's own report is not enough:
+    # (line number, expected, found) for every record whose field count is not
+    # width (by default the first record's, the header's)
+    reader = csv.reader(lines, delimiter=csv_format["sep"], quotechar='"', skipinitialspace=True)
+    mismatched = []
+    line_number = 1
+    for row in reader:
+        if row:
+            width = width or len(row)
+            if len(row) != width:
+                mismatched.append((line_number, width, len(row)))
+        line_number = reader.line_num + 1
+    return mismatched
+
+
+def _scan_mismatched_rows(filepath, csv_format):
+    with open(filepath, newline="", encoding=csv_format["encoding"]) as f:
+        return _mismatched_rows(f, csv_format)
+
+
+def _has_text(data, starts, ends):
+    # Whether each data[start:end] holds more than whitespace
+    if len(starts) < 64:
+        return np.array([bool(data[s:e].tobytes().strip(BLANK_BYTES)) for s, e in zip(starts, ends)], dtype=bool)
+    text = np.r_[0, np.cumsum(~np.isin(data, np.frombuffer(BLANK_BYTES, dtype=np.uint8)))]
+    return text[ends] > text[starts]
+
+
+def _record_spans(f, sep, start=0, end=None, block=QUOTE_SCAN_BLOCK):
+    # (starts, ends, fields) of the records in bytes [start, end) of a binary
+    # file, a block at a time, leaving out blank ones like the parser does. A
+    # newline ends a record when an even number of quotes comes before it; a
+    # stray quote (5") breaks that, which callers notice as a record count
+    # that does not match the rows parsed. fields is the delimiter count plus
+    # one, or -1 when the record has a quote and only the csv module can tell.
+    f.seek(start)
+    offset = record_start = start
+    quotes = delims = record_quotes = record_delims = 0
+    record_text = False
+    while end is None or offset < end:
+        data = np.frombuffer(f.read(block if end is None else min(block, end - offset)), dtype=np.uint8)
+        if not len(data):
+            break
+        quote_at = np.flatnonzero(data == ord('"'))
+        delim_at = np.flatnonzero(data == ord(sep))
+        newlines = np.flatnonzero(data == ord("\n"))
+        quotes_at = quotes + np.searchsorted(quote_at, newlines)
+        newlines, quotes_at = newlines[quotes_at % 2 == 0], quotes_at[quotes_at % 2 == 0]
+        if len(newlines):
+            delims_at = delims + np.searchsorted(delim_at, newlines)
+            starts = np.r_[record_start, offset + newlines[:-1] + 1]
+            fields = np.diff(np.r_[record_delims, delims_at]) + 1
+            quoted = np.diff(np.r_[record_quotes, quotes_at]) > 0
+            # Only a record without delimiters or quotes can be blank
+            keep = (fields > 1) | quoted
+            maybe_blank = np.flatnonzero(~keep)
+            keep[maybe_blank] = _has_text(data, np.maximum(starts[maybe_blank] - offset, 0), newlines[maybe_blank])
+            if len(maybe_blank) and maybe_blank[0] == 0:
+                keep[0] |= record_text
+            yield starts[keep], offset + newlines[keep], np.where(quoted, -1, fields)[keep]
+            record_start, record_quotes, record_delims = offset + newlines[-1] + 1, quotes_at[-1], delims_at[-1]
+            record_text = False
+        record_text = record_text or bool(data[max(record_start - offset, 0):].tobytes().strip(BLANK_BYTES))
+        quotes += len(quote_at)
+        delims += len(delim_at)
+        offset += len(data)
+    if record_text:
+        yield (np.array([record_start]), np.array([offset]),
+               np.array([-1 if quotes > record_quotes else delims - record_delims + 1]))
+
+
+def _line_numbers(f, offsets):
+    # 1-based line of each byte offset (error path only)
+    f.seek(0)
+    newlines, offset = [], 0
+    while True:
+        data = np.frombuffer(f.read(QUOTE_SCAN_BLOCK), dtype=np.uint8)
+        if not len(data):
+            break
+        newlines.append(offset + np.flatnonzero(data == ord("\n")))
+        offset += len(data)
+    newlines = np.concatenate(newlines) if newlines else np.zeros(0, dtype=np.int64)
+    return (np.searchsorted(newlines, offsets) + 1).tolist()
+
+
+def _mismatched_records(f, spans, rows, width, csv_format):
+    # (line number, expected, found) for each of the given records without
+    # width fields; only records with quotes are parsed again
+    starts, ends, fields = (values[rows] for values in spans)
+    for i in np.flatnonzero(fields < 0):
+        f.seek(starts[i])
+        text = f.read(ends[i] - starts[i]).decode(csv_format["encoding"], errors="replace")
+        fields[i] = len(next(csv.reader(StringIO(text, newline=""), delimiter=csv_format["sep"], quotechar='"',
+                                        skipinitialspace=True), []))
+    off = fields != width
+    if not off.any():
+        return []
+    return [(line, width, int(found)) for line, found in zip(_line_numbers(f, starts[off]), fields[off])]
+
+
+def _null_last_field(df):
+    # The C parser pads a row with too few fields with NaN and says nothing, so
+    # only rows whose last field is null can be short
+    return np.flatnonzero(df.iloc[:, -1].isna().to_numpy()) if len(df.columns) else np.zeros(0, dtype=np.int64)
+
+
+def _short_rows(filepath, csv_format, df, skip, start=0, end=None):
+    # Short rows among df, parsed from bytes [start, end) of the file after
+    # skip header records. Only the raw records of rows with a null last field
+    # are looked at again; None when the records found do not line up with
+    # the rows (multi-byte newlines in UTF-16, stray quotes)
+    rows = _null_last_field(df)
+    if not len(rows):
+        return []
+    if csv_format["encoding"] == "utf-16":
+        return None
+    with open(filepath, "rb") as f:
+        spans = [np.concatenate(values) for values in zip(*_record_spans(f, csv_format["sep"], start, end))]
+        if not spans or len(spans[0]) != skip + len(df):
+            return None
+        return _mismatched_records(f, spans, rows + skip, len(df.columns), csv_format)
+
+
+def _read_csv_checked(filepath, csv_format=DEFAULT_CSV_FORMAT, **kwargs):
+    # Parse and validate in the same pass: the C parser flags rows with too many
+    # fields as ParserWarnings, which we collect instead of pre-scanning the file.
+    # index_col=False keeps a first data row with an extra field from turning
+    # the first column into the index (everything would shift one to the left).
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        result = pd.read_csv(
+            filepath,
+            quotechar='"',
+            skipinitialspace=True,
+            encoding=csv_format["encoding"],
+            sep=csv_format["sep"],
+            on_bad_lines="warn",
+            index_col=False,
+            **kwargs,
+        )
+    bad_rows, unplaced = _collect_bad_rows(caught)
+    if not isinstance(filepath, (str, os.PathLike)) or not isinstance(result, pd.DataFrame) or "nrows" in kwargs:
+        # Without a file to scan, a cut row still has to fail the read
+        return result, bad_rows + ([(0, 0, 0)] if unplaced else [])
+
+    short = None
+    if not bad_rows and not unplaced and kwargs.get("usecols") is None:
+        short = _short_rows(filepath, csv_format, result, 0 if kwargs.get("header", "infer") is None else 1)
+    if short is None:
+        # A malformed file is reported in full, with every line that is off
+        short = _scan_mismatched_rows(filepath, csv_format)
+    return result, sorted(set(bad_rows + short))
+
+
+class _RecordCursor:
+    # Hands out the record spans of a file a chunk of rows at a time
+    def __init__(self, f, sep):
+        self.spans = _record_spans(f, sep)
+        self.pending = [np.zeros(0, dtype=np.int64)] * 3
+
+    def take(self, n):
+        # (starts, ends, fields) of the next n records, or None when the file has fewer
+        while len(self.pending[0]) < n:
+            spans = next(self.spans, None)
+            if spans is None:
+                return None
+            self.pending = [np.r_[pending, values] for pending, values in zip(self.pending, spans)]
+        taken = [values[:n] for values in self.pending]
+        self.pending = [values[n:] for values in self.pending]
+        return taken
+
+    def exhausted(self):
+        return not len(self.pending[0]) and next(self.spans, None) is None
+
+
+def iter_csv_chunks(filepath, chunksize=CSV_CHUNKSIZE, **kwargs):
+    # Each chunk is checked against its raw records as it is read: the rows
+    # with a null last field, which may be short, and the first row, which the
+    # parser cuts to the header's width without a warning when it is long.
+    # Once rows and records stop lining up (the parser skipped a row, a stray
+    # quote) the file gets one full scan instead. Nothing is yielded after a
+    # bad row.
+    bad_rows = []
+    csv_format = detect_csv_format(filepath)
+    reader, _ = _read_csv_checked(filepath, csv_format, chunksize=chunksize, **kwargs)
+    lined_up = csv_format["encoding"] != "utf-16" and kwargs.get("usecols") is None
+    with reader, open(filepath, "rb") as raw, open(filepath, "rb") as records:
+        cursor = _RecordCursor(records, csv_format["sep"])
+        if kwargs.get("header", "infer") is not None:
+            lined_up = lined_up and cursor.take(1) is not None
+        if not lined_up:
+            bad_rows.extend(_scan_mismatched_rows(filepath, csv_format))
+        while True:
+            with warnings.catch_warnings(record=True) as caught:
+                warnings.simplefilter("always")
+                try:
+                    chunk = next(reader)
+                except StopIteration:
+                    break
+            skipped, unplaced = _collect_bad_rows(caught)
+            bad_rows.extend(skipped)
+            if lined_up:
+                spans = None if skipped or unplaced else cursor.take(len(chunk))
+                if spans is None:
+                    lined_up = False
+                    bad_rows.extend(_scan_mismatched_rows(filepath, csv_format))
+                else:
+                    rows = np.union1d(_null_last_field(chunk), [0])
+                    bad_rows.extend(_mismatched_records(raw, spans, rows, len(chunk.columns), csv_format))
+            if not bad_rows:
+                yield chunk
+        if lined_up and not cursor.exhausted():
+            bad_rows.extend(_scan_mismatched_rows(filepath, csv_format))
+
+    if bad_rows:
+        bad_rows = sorted(set(bad_rows))
+        report_malformed_rows(filepath, bad_rows, csv_format)
+        raise MalformedCSVError(filepath, bad_rows)
+
+# ---------- PARALLEL CSV INPUT ----------
+# The file is memory-mapped and cut into one byte range per worker. A cut may
+# only fall after a newline that ends a record: a newline inside a quoted field
+# is preceded by an odd number of quote characters ("" escapes add two), so a
+# running quote count proposes cuts without parsing. A stray quote inside an
+# unquoted value (5" screen) throws that count off, so the cuts are checked
+# twice: the first record after each cut must have as many fields as the
+# header, and a piece that ends inside a quoted field fails to parse ("EOF
+# inside string"). Either way the file is read in one pass instead. Each
+# worker maps the file itself and parses its range straight from the mapping.
+
+def _count_quotes(data, start, end):
+    # In blocks, so the comparison never allocates a file-sized array
+    return sum(
+        int(np.count_nonzero(data[i:min(i + QUOTE_SCAN_BLOCK, end)] == ord('"')))
+        for i in range(start, end, QUOTE_SCAN_BLOCK)
+    )
+
+
+def _record_boundaries(mapped, parts):
+    # Offsets [header end, cut, ..., file size]; every range between two of
+    # them holds whole records
+    data = np.frombuffer(mapped, dtype=np.uint8)
+    size = len(data)
+    boundaries = []
+    counted = quotes = 0
+    for part in range(parts):
+        pos = max(part * size // parts, boundaries[-1] if boundaries else 0)
+        while True:
+            newline = mapped.find(b"\n", pos)
+            if newline == -1:
+                newline = size - 1
+                break
+            quotes += _count_quotes(data, counted, newline)
+            counted = newline
+            if quotes % 2 == 0:
+                break
+            pos = newline + 1
+        if not boundaries or newline + 1 > boundaries[-1]:
+            boundaries.append(newline + 1)
+    del data
+    return sorted(set(boundaries + [size]))
+
+
+def _starts_record(mapped, start, csv_format, width, max_lines=100):
+    # The record after a cut, which may span lines inside quotes
+    encoding = "utf-8" if csv_format["encoding"] == "utf-8-sig" else csv_format["encoding"]
+
+    def lines():
+        pos = start
+        for _ in range(max_lines):
+            if pos >= len(mapped):
+                return
+            end = mapped.find(b"\n", pos)
+            end = len(mapped) if end == -1 else end + 1
+            yield mapped[pos:end].decode(encoding, errors="replace")
+            pos = end
+
+    fields = next(csv.reader(lines(), delimiter=csv_format["sep"], skipinitialspace=True), [])
+    return len(fields) == width
+
+
+class _MappedRange(RawIOBase):
+    # Read-only file view of bytes [start, end) of a memory map
+    def __init__(self, mapped, start, end):
+        self.mapped, self.pos, self.end = mapped, start, end
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        n = max(0, min(len(buffer), self.end - self.pos))
+        buffer[:n] = self.mapped[self.pos:self.pos + n]
+        self.pos += n
+        return n
+
+
+def _read_csv_range(filepath, start, end, names, csv_format, columns=None):
+    # (piece, bad rows), or (None, None) when the range does not hold whole records
+    with open(filepath, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        with BufferedReader(_MappedRange(mapped, start, end)) as piece:
+            try:
+                df, bad_rows = _read_csv_checked(piece, csv_format, header=None, names=names, usecols=columns)
+            except pd.errors.ParserError:
+                return None, None
+        if not bad_rows and columns is None:
+            bad_rows = _short_rows(filepath, csv_format, df, 0, start, end)
+        if bad_rows is None or (not bad_rows and columns is not None):
+            # Line numbers are relative to the range; one pass reports the real ones
+            with TextIOWrapper(BufferedReader(_MappedRange(mapped, start, end)), encoding=csv_format["encoding"], newline="") as lines:
+                bad_rows = _mismatched_rows(lines, csv_format, len(names))
+    return df, bad_rows
+
+
+def _concat_pieces(pieces):
+    # Every piece infers its own dtypes. Integers and floats combine like one
+    # pass would type them, and pieces where a column is all null take the
+    # dtype of the others; any other disagreement (text in one piece, numbers
+    # in another) returns None so the caller reads the file in one pass.
+    dtypes = {}
+    for col in pieces[0].columns:
+        seen = {piece[col].dtype for piece in pieces if piece[col].notna().any()}
+        if len(seen) > 1 and not all(pd.api.types.is_numeric_dtype(d) and not pd.api.types.is_bool_dtype(d) for d in seen):
+            return None
+        if len(seen) == 1:
+            dtypes[col] = seen.pop()
+
+    df = pd.concat(pieces, ignore_index=True)
+    for col, dtype in dtypes.items():
+        if pd.api.types.is_string_dtype(dtype) and df[col].dtype != dtype:
+            df[col] = df[col].astype(dtype)
+    return df
+
+
+def read_csv_parallel(filepath, csv_format, columns=None, workers=1):
+    # None when one pass is the better read: a single worker, a small file,
+    # UTF-16 (newline bytes are not newlines there), a cut that may not fall
+    # between records, malformed rows (one pass reports them with file line
+    # numbers) or pieces that typed a column apart
+    workers = resolve_workers(workers)
+    if workers < 2 or csv_format["encoding"] == "utf-16" or os.path.getsize(filepath) < PARALLEL_CSV_MIN_BYTES:
+        return None
+
+    with open(filepath, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        boundaries = _record_boundaries(mapped, workers)
+        with BufferedReader(_MappedRange(mapped, 0, boundaries[0])) as header:
+            names = list(_read_csv_checked(header, csv_format, nrows=0)[0].columns)
+        if not all(_starts_record(mapped, cut, csv_format, len(names)) for cut in boundaries[1:-1]):
+            return None
+    ranges = list(zip(boundaries[:-1], boundaries[1:]))
+
+    print(f"{Fore.CYAN}⚡ Parsing {os.path.getsize(filepath) / 1024 / 1024:.0f} MB in {len(ranges)} pieces...{Style.RESET_ALL}")
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=min(workers, len(ranges))) as pool:
+        futures = [pool.submit(_read_csv_range, filepath, start, end, names, csv_format, columns) for start, end in ranges]
+        results = [future.result() for future in futures]
+    if any(piece is None or bad_rows for piece, bad_rows in results):
+        return None
+    return _concat_pieces([piece for piece, _ in results])
+
+
+# ---------- XLSX INPUT ----------
+
+def _excel_engine():
+    # calamine (Rust) parses XLSX several times faster than openpyxl when installed
+    return "calamine" if importlib.util.find_spec("python_calamine") else "openpyxl"
+
+
+def _resolve_sheet(sheet, sheetnames):
+    # --sheet takes a name or a 0-based position; a sheet literally named "2" wins
+    if sheet is None:
+        return 0
+    if isinstance(sheet, int) or (sheet not in sheetnames and sheet.isdigit()):
+        return int(sheet)
+    return sheet
+
+
+def _excel_header(cells):
+    # Named like read_excel names them: a blank cell becomes "Unnamed: <position>"
+    # and repeats of a name become "name.1", "name.2"... skipping names the
+    # header already has; given names are kept before blank ones
+    names = [f"Unnamed: {i}" if cell is None else cell for i, cell in enumerate(cells)]
+    taken = set(names)
+    seen = Counter()
+    for i in sorted(range(len(cells)), key=lambda i: cells[i] is None):
+        name = original = names[i]
+        count = seen[name]
+        while count:
+            seen[original] = count + 1
+            name = f"{original}.{count}"
+            count = count + 1 if name in taken else seen[name]
+        names[i] = name
+        seen[name] = count + 1
+    return names
+
+
+def iter_xlsx_chunks(filepath, chunksize=CSV_CHUNKSIZE, header="infer", sheet=None):
+    # openpyxl read-only mode parses the sheet XML as it goes, so only the
+    # current chunk of rows is ever held in memory
+    from openpyxl import load_workbook
+
+    wb = load_workbook(filepath, read_only=True, data_only=True)
+    try:
+        sheet = _resolve_sheet(sheet, wb.sheetnames)
+        ws = wb.worksheets[sheet] if isinstance(sheet, int) else wb[sheet]
+        rows = ws.iter_rows(values_only=True)
+        first = next(rows, None)
+        if first is None:
+            return
+        width = len(first)
+        if header is None:
+            columns, buffer = list(range(width)), [first]
+        else:
+            columns, buffer = _excel_header(first), []
+
+        blank = (None,) * width
+        pending_blanks = 0
+        for row in rows:
+            row = tuple(row[:width]) + (None,) * (width - len(row))
+            # Blank rows are kept between data rows but trimmed at the end of
+            # the sheet, like read_excel does
+            if row == blank:
+                pending_blanks += 1
+                continue
+            buffer.extend([blank] * pending_blanks)
+            pending_blanks = 0
+            buffer.append(row)
+            if len(buffer) >= chunksize:
+                yield pd.DataFrame(buffer[:chunksize], columns=columns)
+                buffer = buffer[chunksize:]
+        if buffer:
+            yield pd.DataFrame(buffer, columns=columns)
+    finally:
+        wb.close()
+
+
+def iter_file_chunks(filepath, chunksize=CSV_CHUNKSIZE, header="infer", sheet=None):
+    if Path(filepath).suffix.lower() in [".xlsx", ".xlsm"]:
+        return iter_xlsx_chunks(filepath, chunksize=chunksize, header=header, sheet=sheet)
+    return iter_csv_chunks(filepath, chunksize=chunksize, header=header)
+
+# ---------- PARQUET / ARROW IPC ----------
+
+def _columnar_format(filepath):
+    return COLUMNAR_FORMATS.get(Path(filepath).suffix.lower())
+
+
+def _arrow_safe(df):
+    # Normalizers keep what they cannot convert next to what they can ("5%" among
+    # amounts, "maybe" among True/False); Arrow columns hold one type, so those
+    # columns are written as text (nulls stay null)
+    mixed = {}
+    for col in df.columns:
+        if pd.api.types.is_object_dtype(df[col].dtype):
+            values = df[col].dropna()
+            if values.map(type).nunique() > 1:
+                mixed[col] = df[col].map(str, na_action="ignore").astype(object)
+    if mixed:
+        df = df.copy()
+        for col, values in mixed.items():
+            df[col] = values
+    return df
+
+
+def _table_with_attrs(df):
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(_arrow_safe(df), preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    attrs = {key: value for key, value in df.attrs.items() if key not in UNSAVED_ATTRS}
+    if attrs:
+        metadata[ATTRS_METADATA_KEY] = json.dumps(attrs, default=str).encode("utf-8")
+    return table.replace_schema_metadata(metadata)
+
+
+def _attrs_from_schema(schema):
+    raw = (schema.metadata or {}).get(ATTRS_METADATA_KEY)
+    attrs = json.loads(raw) if raw else {}
+    # Files written before highlight_nulls was left out still carry it
+    return {key: value for key, value in attrs.items() if key not in UNSAVED_ATTRS}
+
+
+def _to_pandas(table, attrs):
+    df = table.to_pandas()
+    df.attrs = dict(attrs)
+    return df
+
+
+def read_columnar(filepath, columns=None):
+    # Only the projected columns are read from disk
+    if _columnar_format(filepath) == "parquet":
+        import pyarrow.parquet as pq
+        table = pq.read_table(filepath, columns=columns)
+    else:
+        import pyarrow.feather as feather
+        table = feather.read_table(filepath, columns=columns, memory_map=True)
+    return _to_pandas(table, _attrs_from_schema(table.schema))
+
+
+def iter_columnar_chunks(filepath, columns=None):
+    # One DataFrame per Parquet row group / Arrow IPC record batch, so memory is
+    # bounded by the row group size the file was written with
+    if _columnar_format(filepath) == "parquet":
+        import pyarrow.parquet as pq
+        parquet_file = pq.ParquetFile(filepath)
+        attrs = _attrs_from_schema(parquet_file.schema_arrow)
+        for i in range(parquet_file.num_row_groups):
+            yield _to_pandas(parquet_file.read_row_group(i, columns=columns), attrs)
+    else:
+        import pyarrow as pa
+        with pa.memory_map(str(filepath)) as source:
+            reader = pa.ipc.open_file(source)
+            attrs = _attrs_from_schema(reader.schema)
+            for i in range(reader.num_record_batches):
+                batch = reader.get_batch(i)
+                if columns is not None:
+                    batch = batch.select(columns)
+                yield _to_pandas(pa.Table.from_batches([batch]), attrs)
+
+
+def write_columnar(df, output_path, row_group_size=ROW_GROUP_SIZE):
+    table = _table_with_attrs(df)
+    if _columnar_format(output_path) == "parquet":
+        import pyarrow.parquet as pq
+        pq.write_table(table, output_path, row_group_size=row_group_size)
+    else:
+        import pyarrow.feather as feather
+        # Record batches follow the in-memory chunks, which can be tiny after a concat
+        feather.write_feather(table.combine_chunks(), output_path, chunksize=row_group_size)
+
+# ---------- LOAD / SAVE ----------
+
+def load_file(filepath, columns=None, sheet=None, workers=1):
     ext = Path(filepath).suffix.lower()
     if ext == ".csv":
-        with open(filepath, newline='', encoding='utf-8') as f:
-            reader = csv.reader(f)
-            header = next(reader)
-            expected_cols = len(header)
-
-            for row_number, row in enumerate(reader, start=2):  # start=2 because header is row 1
-                if len(row) != expected_cols:
-                    # Find first mismatch column index
-                    mismatched_cols = [i for i in range(min(len(row), expected_cols)) if ',' in row[i] and not (row[i].startswith('"') and row[i].endswith('"'))]
-                    col_hint = f"Possible issue at column {mismatched_cols[0]+1}" if mismatched_cols else "Check currency columns"
-                    
-                    print(f"\n⚠️  Malformed CSV: Row {row_number} has {len(row)} columns but header has {expected_cols}.")
-                    print(f"📍 {col_hint}")
-                    print(f"💡 Tip: Check for unquoted currency values with commas")
-                    print(f"📌 Fix: Wrap currency values in double quotes to preserve column structure.")
-                    exit(1)
-
-        # If valid, load normally
-        return pd.read_csv(filepath, quotechar='"', skipinitialspace=True)
+        csv_format = detect_csv_format(filepath)
+        df = read_csv_arrow(filepath, columns, csv_format)
+        if df is None:
+            df = read_csv_parallel(filepath, csv_format, columns, workers)
+        if df is None:
+            df, bad_rows = _read_csv_checked(filepath, csv_format, usecols=columns)
+            if bad_rows:
+                report_malformed_rows(filepath, bad_rows, csv_format)
+                raise MalformedCSVError(filepath, bad_rows)
     elif ext in [".xlsx", ".xls"]:
-        return pd.read_excel(filepath, engine="openpyxl")
+        with pd.ExcelFile(filepath, engine=_excel_engine()) as book:
+            sheet_name = _resolve_sheet(sheet, book.sheet_names)
+            df = book.parse(sheet_name, usecols=columns)
+    elif ext in COLUMNAR_FORMATS:
+        df = read_columnar(filepath, columns=columns)
     else:
         raise ValueError("Unsupported file type.")
 
+    # Lets later stages key cached results to the file they came from
+    df.attrs["source_path"] = str(Path(filepath).resolve()) + (f"#{sheet}" if sheet is not None else "")
+    return df
+
 
-def save_file(df, output_path):
+def save_file(df, output_path, append=False):
     ext = Path(output_path).suffix.lower()
     if ext == ".csv":
-        df.to_csv(output_path, index=False)
+        if append:
+            df.to_csv(output_path, index=False, mode="a", header=False)
+        else:
+            df.to_csv(output_path, index=False)
     elif ext in [".xlsx", ".xls"]:
-        df.to_excel(output_path, index=False)
-        if "highlight_nulls" in df.attrs:
-            highlight_rows_in_excel(output_path, df.attrs["highlight_nulls"])
+        if append:
+            raise ValueError("Appending is only supported for CSV output.")
+        write_xlsx(df, output_path, df.attrs.get("highlight_nulls"))
+    elif ext in COLUMNAR_FORMATS:
+        if append:
+            raise ValueError("Appending is only supported for CSV output.")
+        write_columnar(df, output_path)
     else:
         raise ValueError("Unsupported file type.")
 
-def highlight_rows_in_excel(filepath, row_indices):
-    wb = load_workbook(filepath)
-    ws = wb.active
-    red_fill = PatternFill(start_color='FFC7CE', end_color='FFC7CE', fill_type='solid')
+# ---------- XLSX OUTPUT ----------
+
+def _row_runs(row_indices):
+    # [2, 3, 4, 9] -> [(2, 4), (9, 9)]
+    runs = []
+    for row in sorted(set(row_indices)):
+        if runs and row == runs[-1][1] + 1:
+            runs[-1][1] = row
+        else:
+            runs.append([row, row])
+    return runs
+
+
+def write_xlsx(df, output_path, highlight_rows=None):
+    # Single pass in openpyxl's write-only mode: rows are streamed to disk as
+    # they are appended, and the null-row fill is one conditional formatting
+    # rule over the flagged ranges instead of a per-cell fill after a re-read.
+    from openpyxl import Workbook
+    from openpyxl.formatting.rule import FormulaRule
+    from openpyxl.styles import PatternFill
+    from openpyxl.utils import get_column_letter
 
-    for row_idx in row_indices:
-        excel_row = row_idx + 2  # +1 for 0-based index, +1 for header
-        for col in range(1, ws.max_column + 1):
-            ws.cell(row=excel_row, column=col).fill = red_fill
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Sheet1")
 
-    wb.save(filepath)
+    if highlight_rows and len(df.columns):
+        last_col = get_column_letter(len(df.columns))
+        # +1 for 0-based index, +1 for header
+        ranges = " ".join(f"A{first + 2}:{last_col}{last + 2}" for first, last in _row_runs(highlight_rows))
+        red_fill = PatternFill(start_color='FFC7CE', end_color='FFC7CE', fill_type='solid')
+        ws.conditional_formatting.add(ranges, FormulaRule(formula=["TRUE"], fill=red_fill))
 
+    ws.append([str(col) for col in df.columns])
+    values = df.astype(object).where(df.notna(), None)
+    for row in values.itertuples(index=False, name=None):
+        ws.append(row)
+    wb.save(output_path)
@@ -0,0 +1,108 @@
+import re
+import numpy as np
+import pandas as pd
+from cleaning.fuzzy_index import pair_scores
+
+# Near-duplicate rows: key values that differ only by casing, spacing,
+# punctuation or a typo ("John Doe" / "john  doe"). Scoring every pair of rows
+# is quadratic, so candidates come from a sorted neighbourhood instead: rows
+# are sorted by their normalized key, and again by the reversed key (which
+# brings together keys that differ near the start), and each row is only
+# compared with the next WINDOW rows of each order. A candidate pair matches
+# when every key column scores at least the threshold with fuzz.ratio. Groups
+# are formed greedily in key order: a key not grouped yet takes every
+# ungrouped key it matches, so each member matches its group's first key and
+# groups never chain through their pairs. Cost is one sort per order plus
+# WINDOW scored pairs per row.
+
+NEAR_DUPLICATE_THRESHOLD = 90
+WINDOW = 10
+
+# Casing, punctuation and runs of whitespace do not tell two records apart
+_SEPARATORS_RE = re.compile(r"[\W_]+")
+
+
+def normalize_key(series):
+    text = series.astype(object).where(series.notna(), "").astype(str)
+    return text.str.lower().str.replace(_SEPARATORS_RE, " ", regex=True).str.strip()
+
+
+def candidate_pairs(sort_keys, window=WINDOW):
+    # (i, j) row positions with i < j, each pair once
+    n = len(sort_keys[0])
+    if n < 2:
+        return np.empty((0, 2), dtype=np.int64)
+    codes = []
+    for key in sort_keys:
+        order = key.argsort(kind="stable").to_numpy()
+        for step in range(1, min(window, n - 1) + 1):
+            first, second = order[:-step], order[step:]
+            codes.append(np.minimum(first, second) * n + np.maximum(first, second))
+    codes = np.sort(np.concatenate(codes))
+    codes = codes[np.r_[True, codes[1:] != codes[:-1]]]
+    return np.stack([codes // n, codes % n], axis=1)
+
+
+def _group_pairs(pairs, n):
+    # Matches chain ("aaaa" ~ "aaab" ~ "aabb" ~ ...), so connected components
+    # of the pairs could join keys that are nothing alike. Keys are taken in
+    # order instead: a key not grouped yet takes every ungrouped key it matches,
+    # so every member matches its group's first key. Returns that first key
+    # per key (-1 for keys left alone).
+    group = np.full(n, -1)
+    pairs = pairs[np.lexsort((pairs[:, 1], pairs[:, 0]))]
+    starts = np.searchsorted(pairs[:, 0], np.arange(n + 1))
+    for key in np.unique(pairs[:, 0]).tolist():
+        if group[key] >= 0:
+            continue
+        matched = pairs[starts[key]:starts[key + 1], 1]
+        matched = matched[group[matched] < 0]
+        if len(matched):
+            group[key] = key
+            group[matched] = key
+    return group
+
+
+def find_near_duplicates(df, columns, threshold=NEAR_DUPLICATE_THRESHOLD, window=WINDOW):
+    # Groups of row positions (sorted, groups ordered by their first row); the
+    # key columns of every row score >= threshold against the group's first row
+    keys = [normalize_key(df[col]) for col in columns]
+    combined = keys[0]
+    for key in keys[1:]:
+        combined = combined + " | " + key
+
+    # Rows with the same normalized key match outright, so the neighbourhood
+    # only runs over the distinct keys, numbered in order of their first row
+    codes, uniques = pd.factorize(combined)
+    rows = np.arange(len(codes))
+    first = np.empty(len(uniques), dtype=np.int64)
+    first[codes[::-1]] = rows[::-1]
+    keys = [key.iloc[first].reset_index(drop=True) for key in keys]
+    combined = combined.iloc[first].reset_index(drop=True)
+
+    # Keys without any value never match
+    has_key = np.logical_or.reduce([(key != "").to_numpy() for key in keys])
+
+    pairs = candidate_pairs([combined, combined.str[::-1]], window)
+    pairs = pairs[has_key[pairs[:, 0]] & has_key[pairs[:, 1]]]
+
+    # Each column only scores the pairs that still match on the columns before;
+    # equal values (two empty ones included) match without scoring
+    for key in keys:
+        values, lengths = key.to_numpy(dtype=object), key.str.len().to_numpy()
+        left, right = pairs[:, 0], pairs[:, 1]
+        differ = values[left] != values[right]
+        matched = ~differ
+        left, right = left[differ], right[differ]
+        scores = pair_scores(values[left], values[right], lengths[left] + lengths[right])
+        matched[differ] = scores >= threshold
+        pairs = pairs[matched]
+
+    # Back to rows: a group of keys, or one key that several rows share
+    group = _group_pairs(pairs, len(uniques))
+    group = np.where(group >= 0, group, np.arange(len(uniques)))
+    group_of_row = np.where(has_key[codes], group[codes], -1)
+    order = np.argsort(group_of_row, kind="stable")
+    bounds = np.flatnonzero(np.diff(group_of_row[order])) + 1
+    groups = [g for g in np.split(order, bounds) if len(g) > 1 and group_of_row[g[0]] >= 0]
+    return sorted(groups, key=lambda g: g[0])
@@ -0,0 +1,126 @@
+import io
+import os
+import sys
+import threading
+from contextlib import redirect_stdout
+from cleaning.instrumentation import (
+    profile_stage,
+    profiling_options,
+    current_depth,
+    enable_profiling,
+    take_records,
+    add_records
+)
+from cleaning.report import enable_report, report_enabled, take_sections, add_sections
+from cleaning.engine import arrow_engine
+from cleaning.cache import flush_cache
+
+# Column-parallel execution of the normalization stage. Once inferred_types is
+# known every column is independent, so each one can run in its own process.
+# Worker output is captured and replayed in column order so the console report
+# reads the same as a sequential run. With the arrow engine the columns run in
+# threads instead: Arrow's string kernels release the GIL, and nothing has to
+# be pickled between processes.
+
+
+def resolve_workers(workers):
+    if not workers or workers < 0:
+        return os.cpu_count() or 1
+    return workers
+
+
+def _stage_name(func, series, inferred_type):
+    return f"{func.__name__}[{inferred_type or '-'}] {series.name}"
+
+
+def _run_captured(func, series, inferred_type, kwargs, profiling, reporting):
+    if profiling is not None:
+        # Per-stage cProfile dumps stay in the parent process
+        enable_profiling(trace_memory=profiling["trace_memory"])
+    if reporting:
+        enable_report()
+    buffer = io.StringIO()
+    with redirect_stdout(buffer):
+        with profile_stage(_stage_name(func, series, inferred_type), len(series)):
+            result = func(series, inferred_type, **kwargs)
+    # Cache entries this worker added would be lost with the process
+    flush_cache()
+    return result, buffer.getvalue(), take_records(), take_sections()
+
+
+class _ThreadStdout:
+    # Stand-in for sys.stdout that sends each worker thread's prints to its own buffer
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+
+    def write(self, text):
+        return getattr(self.local, "buffer", self.stream).write(text)
+
+    def flush(self):
+        self.stream.flush()
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+
+def _run_in_thread(stdout, depth, func, series, inferred_type, kwargs):
+    stdout.local.buffer = io.StringIO()
+    try:
+        with profile_stage(_stage_name(func, series, inferred_type), len(series), thread_depth=depth):
+            result = func(series, inferred_type, **kwargs)
+        return result, stdout.local.buffer.getvalue()
+    finally:
+        del stdout.local.buffer
+
+
+def _map_columns_threaded(df, func, inferred_types, workers, kwargs):
+    from concurrent.futures import ThreadPoolExecutor
+    stdout = _ThreadStdout(sys.stdout)
+    sys.stdout = stdout
+    try:
+        with ThreadPoolExecutor(max_workers=min(workers, len(df.columns))) as pool:
+            futures = [
+                pool.submit(_run_in_thread, stdout, current_depth(), func, df[col], inferred_types.get(col, ""), kwargs)
+                for col in df.columns
+            ]
+            for col, future in zip(df.columns, futures):
+                series, log = future.result()
+                stdout.stream.write(log)
+                df[col] = series
+    finally:
+        sys.stdout = stdout.stream
+    sys.stdout.flush()
+    return df
+
+
+def map_columns(df, func, inferred_types, workers=1, **kwargs):
+    # func(series, inferred_type, **kwargs) -> cleaned series; must be a
+    # module-level function so it can be pickled to the workers
+    workers = resolve_workers(workers)
+    if workers == 1 or len(df.columns) < 2:
+        for col in df.columns:
+            inferred_type = inferred_types.get(col, "")
+            with profile_stage(_stage_name(func, df[col], inferred_type), len(df)):
+                df[col] = func(df[col], inferred_type, **kwargs)
+        return df
+
+    if arrow_engine():
+        return _map_columns_threaded(df, func, inferred_types, workers, kwargs)
+
+    # multiprocessing is only imported when a pool is actually used
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=min(workers, len(df.columns))) as pool:
+        futures = [
+            pool.submit(_run_captured, func, df[col], inferred_types.get(col, ""), kwargs,
+                        profiling_options(), report_enabled())
+            for col in df.columns
+        ]
+        for col, future in zip(df.columns, futures):
+            series, log, records, sections = future.result()
+            sys.stdout.write(log)
+            add_records(records)
+            add_sections(sections)
+            df[col] = series
+    sys.stdout.flush()
+    return df
@@ -0,0 +1,66 @@
+import json
+from pathlib import Path
+from colorama import Fore, Style
+
+# A cleaning plan records every decision an interactive run takes so the same
+# clean can be replayed on same-schema files without prompts:
+#
+#   headers       source_columns, keep_positions, header_is_data, columns
+#   column_types  {column: inferred type}
+#   date_formats  {column: strftime format}
+#   dedupe        {columns, keep, newest_by, fuzzy}
+#   nulls         "drop" or "highlight"
+#
+# Stages replay the sections that are present and record the ones they had to ask for.
+
+PLAN_SECTIONS = ["headers", "column_types", "date_formats", "dedupe", "nulls"]
+# Sections a stage asks for when they are missing; date formats are asked
+# along with the column types
+ASKED_SECTIONS = ["headers", "column_types", "dedupe", "nulls"]
+
+
+def missing_sections(plan):
+    return [section for section in ASKED_SECTIONS if section not in plan]
+
+
+def _is_yaml(path):
+    return Path(path).suffix.lower() in [".yml", ".yaml"]
+
+
+def _yaml():
+    try:
+        import yaml
+    except ImportError:
+        raise ImportError("YAML cleaning plans need PyYAML (pip install pyyaml)") from None
+    return yaml
+
+
+def load_plan(path):
+    if not Path(path).is_file():
+        raise FileNotFoundError(f"Cleaning plan not found: {path}")
+    with open(path, encoding="utf-8") as f:
+        if _is_yaml(path):
+            plan = _yaml().safe_load(f) or {}
+        else:
+            plan = json.load(f)
+
+    unknown = set(plan) - set(PLAN_SECTIONS)
+    if unknown:
+        raise ValueError(f"Unknown section(s) in cleaning plan {path}: {sorted(unknown)}")
+    dedupe = plan.get("dedupe") or {}
+    if dedupe.get("keep") == "newest" and not dedupe.get("newest_by"):
+        raise ValueError(f"dedupe.keep 'newest' in cleaning plan {path} needs a dedupe.newest_by column")
+    fuzzy = dedupe.get("fuzzy")
+    if fuzzy is not None and not (isinstance(fuzzy, int) and 0 <= fuzzy <= 100):
+        raise ValueError(f"dedupe.fuzzy in cleaning plan {path} must be a threshold between 0 and 100, got {fuzzy!r}")
+    print(f"{Fore.CYAN}📋 Replaying cleaning plan: {path}{Style.RESET_ALL}")
+    return plan
+
+
+def save_plan(plan, path):
+    with open(path, "w", encoding="utf-8") as f:
+        if _is_yaml(path):
+            _yaml().safe_dump(plan, f, sort_keys=False, allow_unicode=True)
+        else:
+            json.dump(plan, f, indent=2, ensure_ascii=False)
+    print(f"{Fore.GREEN}📋 Cleaning plan saved to: {path}{Style.RESET_ALL}")
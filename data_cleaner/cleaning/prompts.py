@@ -1,9 +1,12 @@
-import questionary
+# questionary pulls in prompt_toolkit, which is slow to import. Each prompt
+# imports it on first use so runs driven by flags or a plan never load it.
 
 def ask_yes_no(question):
+    import questionary
     return questionary.confirm(question, default=True).ask()
 
 def ask_custom_headers(count):
+    import questionary
     headers = []
     for i in range(count):
         name = questionary.text(f"Enter name for column {i + 1}:").ask()
@@ -11,12 +14,14 @@ def ask_custom_headers(count):
     return headers
 
 def ask_columns(column_list):
+    import questionary
     return questionary.checkbox(
         "Select columns to check for uniqueness:",
         choices=column_list
     ).ask()
 
 def select_row_to_keep(df_rows):
+    import questionary
     choices = []
     for idx, row in df_rows.iterrows():
         summary = f"[{idx}] " + ", ".join(str(val) for val in row.values)
@@ -28,6 +33,7 @@ def select_row_to_keep(df_rows):
     ).ask()
 
 def ask_date_format():
+    import questionary
     return questionary.select(
         "Choose your preferred date format for output:",
         choices=[
@@ -0,0 +1,121 @@
+import json
+from pathlib import Path
+import pandas as pd
+from colorama import Fore, Style
+
+# Console output is capped to a preview; with --report the full detail (every
+# null cell, every distinct categorical value, every typo fix) is collected as
+# long-form tables and written once at the end as CSV, JSON or HTML.
+
+PREVIEW_ROWS = 20
+PREVIEW_VALUES = 30
+REPORT_FORMATS = [".csv", ".json", ".html"]
+
+_sections = None
+
+
+def enable_report():
+    global _sections
+    _sections = {}
+
+
+def report_enabled():
+    return _sections is not None
+
+
+def add_section(name, frame):
+    # Sections with the same name (e.g. one per column) are concatenated
+    if _sections is not None and not frame.empty:
+        _sections.setdefault(name, []).append(frame)
+
+
+def take_sections():
+    if _sections is None:
+        return {}
+    sections = dict(_sections)
+    _sections.clear()
+    return sections
+
+
+def add_sections(sections):
+    for name, frames in sections.items():
+        for frame in frames:
+            add_section(name, frame)
+
+
+def more_hint(hidden, what):
+    where = "full list in the report" if _sections is not None else "use --report PATH for the full list"
+    return f"{Fore.CYAN}… {hidden} more {what} ({where}){Style.RESET_ALL}"
+
+
+def preview_list(values, what, limit=PREVIEW_VALUES):
+    values = list(values)
+    print(values[:limit])
+    if len(values) > limit:
+        print(more_hint(len(values) - limit, what))
+
+# ---------- NULL STATISTICS ----------
+
+def null_statistics(df):
+    nulls = df.isna()
+    per_row = nulls.sum(axis=1)
+    has_nulls = per_row > 0
+    return {
+        "nulls": nulls,
+        "mask": has_nulls,
+        "per_column": nulls.sum(),
+        "null_rows": df.index[has_nulls.to_numpy()],
+        "null_count": int(per_row.sum()),
+        # {nulls in a row: number of rows}
+        "row_histogram": per_row[has_nulls].value_counts().sort_index(),
+    }
+
+
+def print_null_report(df, stats, limit=PREVIEW_ROWS):
+    per_column = stats["per_column"][stats["per_column"] > 0]
+    print(f"{Fore.CYAN}Nulls per column: " + ", ".join(f"{col}={count}" for col, count in per_column.items()) + Style.RESET_ALL)
+    print(f"{Fore.CYAN}Rows by number of nulls: " + ", ".join(f"{k}→{n}" for k, n in stats["row_histogram"].items()) + Style.RESET_ALL)
+
+    # Print the first rows with red-colored NaNs
+    preview = df[stats["mask"]].head(limit)
+    for idx, row in preview.iterrows():
+        pretty = []
+        for val in row.values:
+            if pd.isna(val):
+                pretty.append(f"{Fore.RED}{Style.BRIGHT}NaN{Style.RESET_ALL}")
+            else:
+                pretty.append(str(val))
+        print(f"{idx}\t" + "\t".join(pretty))
+    if len(stats["null_rows"]) > limit:
+        print(more_hint(len(stats["null_rows"]) - limit, "rows with nulls"))
+
+    if _sections is not None:
+        cells = stats["nulls"].stack()
+        cells = cells[cells].index.to_frame(index=False, name=["row", "column"])
+        add_section("null_cells", cells)
+        add_section("null_counts", per_column.rename_axis("column").reset_index(name="count"))
+        add_section("null_histogram", stats["row_histogram"].rename_axis("nulls_in_row").reset_index(name="rows"))
+
+# ---------- REPORT FILE ----------
+
+def write_report(path):
+    if _sections is None:
+        return
+    tables = {name: pd.concat(frames, ignore_index=True) for name, frames in _sections.items()}
+    ext = Path(path).suffix.lower()
+    if ext == ".json":
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({name: table.to_dict(orient="records") for name, table in tables.items()},
+                      f, indent=2, ensure_ascii=False, default=str)
+    elif ext == ".html":
+        body = "".join(f"<h2>{name}</h2>\n{table.to_html(index=False)}\n" for name, table in tables.items())
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(f"<html><head><meta charset=\"utf-8\"><title>Data Cleaner report</title></head><body>\n{body}</body></html>\n")
+    else:
+        # One long-form CSV; the section column tells the tables apart. Object
+        # columns keep row numbers integral where other sections leave gaps.
+        frames = [table.astype(object).assign(section=name) for name, table in tables.items()]
+        report = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=["section"])
+        report = report[["section"] + [c for c in report.columns if c != "section"]]
+        report.to_csv(path, index=False)
+    print(f"{Fore.GREEN}📝 Report saved to: {path}{Style.RESET_ALL}")
@@ -0,0 +1,173 @@
+import os
+import numpy as np
+import pandas as pd
+from collections import Counter
+from pathlib import Path
+from colorama import Fore, Style
+from cleaning.io import iter_file_chunks, save_file, CSV_CHUNKSIZE
+from cleaning.core import check_and_fix_headers, ask_dedupe_columns
+from cleaning.inference import suggest_and_fix_column_types, apply_column_types
+from cleaning.type_detection import SAMPLE_SIZE, MIN_CONFIDENCE
+from cleaning.format_cleaning import (
+    normalize_column_format,
+    build_correction_map,
+    apply_correction_map,
+    print_corrections
+)
+from cleaning.prompts import ask_yes_no
+from cleaning.report import add_section
+
+# Streaming mode: decisions are taken on a sample, then every chunk of the file
+# is cleaned and appended to the output so memory stays flat.
+SAMPLE_ROWS = 10_000
+
+# ---------- PASS 0: DECISIONS FROM A SAMPLE ----------
+
+def plan_from_sample(filepath, plan, sample_rows=SAMPLE_ROWS, inference="native", sheet=None,
+                     sample_size=SAMPLE_SIZE, min_confidence=MIN_CONFIDENCE):
+    sample = next(iter_file_chunks(filepath, chunksize=sample_rows, sheet=sheet))
+    sample = check_and_fix_headers(sample, plan)
+    suggest_and_fix_column_types(sample, plan, backend=inference, sample_size=sample_size,
+                                 min_confidence=min_confidence)
+    return plan
+
+
+def iter_prepared_chunks(filepath, plan, chunksize, sheet=None):
+    header_plan = plan["headers"]
+    header = None if header_plan["header_is_data"] else "infer"
+    for chunk in iter_file_chunks(filepath, chunksize=chunksize, header=header, sheet=sheet):
+        chunk = chunk.iloc[:, header_plan["keep_positions"]]
+        chunk.columns = header_plan["columns"]
+        chunk = apply_column_types(chunk, plan["column_types"], plan.get("date_formats", {}))
+        yield chunk.reset_index(drop=True)
+
+
+def iter_kept_chunks(filepath, plan, keep, chunksize, sheet=None):
+    offset = 0
+    for chunk in iter_prepared_chunks(filepath, plan, chunksize, sheet):
+        if keep is not None:
+            mask = keep[offset:offset + len(chunk)]
+            offset += len(chunk)
+            chunk = chunk[mask].reset_index(drop=True)
+        yield chunk
+
+# ---------- PASS 1: DUPLICATE KEYS ----------
+
+def canonical_keys(series):
+    # Each chunk types its columns on its own: ids are int64 in one chunk and
+    # float64 in the next when it holds a null. Keys are hashed as text, with
+    # whole floats written like integers, so 1 and 1.0 are the same key.
+    text = series.astype(str).astype(object)
+    if pd.api.types.is_float_dtype(series.dtype):
+        values = series.to_numpy(dtype=float, na_value=np.nan)
+        whole = np.isfinite(values) & (values % 1 == 0) & (np.abs(values) < 2 ** 53)
+        text[whole] = values[whole].astype(np.int64).astype(str)
+    return text.where(series.notna(), None)
+
+
+def find_rows_to_keep(filepath, plan, chunksize, keep="ask", newest_by=None, sheet=None):
+    columns, keep, _ = ask_dedupe_columns(plan["headers"]["columns"], keep, newest_by, plan)
+    if not columns:
+        return None
+    if keep not in ["first", "last"]:
+        print(f"{Fore.YELLOW}⚠️ Streaming mode only supports keep policies 'first' and 'last'; using 'first'.{Style.RESET_ALL}")
+        keep = "first"
+
+    # Only 8-byte hashes per row are held in memory, never the rows themselves
+    key_hashes = []
+    for chunk in iter_prepared_chunks(filepath, plan, chunksize, sheet):
+        keys = pd.DataFrame({col: canonical_keys(chunk[col]) for col in columns})
+        key_hashes.append(pd.util.hash_pandas_object(keys, index=False).to_numpy())
+    key_hashes = np.concatenate(key_hashes) if key_hashes else np.array([], dtype="uint64")
+
+    if keep == "last":
+        _, last_seen = np.unique(key_hashes[::-1], return_index=True)
+        kept_rows = len(key_hashes) - 1 - last_seen
+    else:
+        _, kept_rows = np.unique(key_hashes, return_index=True)
+    mask = np.zeros(len(key_hashes), dtype=bool)
+    mask[kept_rows] = True
+
+    dropped = len(mask) - int(mask.sum())
+    if dropped:
+        print(f"{Fore.YELLOW}⚠️ Found {dropped} duplicate rows; keeping the {keep} row of each key.{Style.RESET_ALL}")
+    else:
+        print(f"{Fore.GREEN}✅ No duplicates found based on selected column(s).{Style.RESET_ALL}")
+    return mask
+
+# ---------- PASS 2: NULL COUNTS & CATEGORICAL FREQUENCIES ----------
+
+def collect_statistics(filepath, plan, keep, chunksize, sheet=None):
+    categorical = [c for c, t in plan["column_types"].items() if t == "categorical"]
+    freq_maps = {col: Counter() for col in categorical}
+    null_rows = 0
+    null_count = 0
+    per_column = None
+
+    for chunk in iter_kept_chunks(filepath, plan, keep, chunksize, sheet):
+        nulls = chunk.isnull()
+        null_rows += int(nulls.any(axis=1).sum())
+        null_count += int(nulls.sum().sum())
+        per_column = nulls.sum() if per_column is None else per_column + nulls.sum()
+        for col in categorical:
+            freq_maps[col].update(chunk[col].dropna().astype(str).str.strip().str.lower().value_counts().to_dict())
+
+    # Per-cell positions are not kept across chunks; the report gets the totals
+    if per_column is not None:
+        per_column = per_column[per_column > 0]
+        add_section("null_counts", per_column.rename_axis("column").reset_index(name="count"))
+    for col, freq_map in freq_maps.items():
+        add_section("categorical_values", pd.DataFrame({"column": col, "value": list(freq_map), "count": list(freq_map.values())}))
+    return null_rows, null_count, freq_maps
+
+# ---------- PASS 3: CLEAN & WRITE ----------
+
+def clean_in_chunks(filepath, output_path, chunksize=CSV_CHUNKSIZE, sample_rows=SAMPLE_ROWS,
+                    keep="ask", newest_by=None, plan=None, inference="native", sheet=None,
+                    sample_size=SAMPLE_SIZE, min_confidence=MIN_CONFIDENCE):
+    print(f"\n{Fore.MAGENTA}🌊 Streaming mode: deciding on a {sample_rows}-row sample, cleaning {chunksize} rows at a time.{Style.RESET_ALL}")
+    plan = {} if plan is None else plan
+    plan_from_sample(filepath, plan, sample_rows, inference, sheet, sample_size, min_confidence)
+
+    keep_mask = find_rows_to_keep(filepath, plan, chunksize, keep, newest_by, sheet)
+
+    null_rows, null_count, freq_maps = collect_statistics(filepath, plan, keep_mask, chunksize, sheet)
+    drop_nulls = plan.get("nulls") == "drop"
+    if null_rows:
+        print(f"{Fore.YELLOW}⚠️ Found {null_count} null values in {null_rows} rows.{Style.RESET_ALL}")
+        if "nulls" not in plan:
+            drop_nulls = ask_yes_no("Would you like to delete all rows with null values?")
+            plan["nulls"] = "drop" if drop_nulls else "highlight"
+    else:
+        print(f"{Fore.GREEN}✅ No null values found.{Style.RESET_ALL}")
+
+    correction_maps = {col: build_correction_map(freq_map) for col, freq_map in freq_maps.items()}
+    for col, correction_map in correction_maps.items():
+        if correction_map:
+            print(f"{Fore.YELLOW}⚠️ Auto-corrected fuzzy typos in {col}:{Style.RESET_ALL}")
+            print_corrections(col, correction_map)
+
+    # Chunks go to a temporary file that only replaces the output once every
+    # chunk is written, so a run that fails midway leaves no partial output
+    partial = Path(output_path).with_suffix(f".{os.getpid()}.tmp{Path(output_path).suffix}")
+    try:
+        first = True
+        for chunk in iter_kept_chunks(filepath, plan, keep_mask, chunksize, sheet):
+            if drop_nulls:
+                chunk = chunk.dropna().reset_index(drop=True)
+
+            for col in chunk.columns:
+                inferred_type = plan["column_types"].get(col, "")
+                if normalize_column_format(chunk, col, inferred_type, verbose=False):
+                    chunk[col] = apply_correction_map(chunk[col], correction_maps[col])
+
+            save_file(chunk, partial, append=not first)
+            first = False
+
+        if first:
+            save_file(pd.DataFrame(columns=plan["headers"]["columns"]), partial)
+    except BaseException:
+        partial.unlink(missing_ok=True)
+        raise
+    os.replace(partial, output_path)
+    return plan
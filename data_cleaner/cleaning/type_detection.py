@@ -0,0 +1,171 @@
+import re
+from math import erf, sqrt
+import numpy as np
+import pandas as pd
+
+# Native column type detection: regex and cardinality statistics computed on a
+# stratified sample of each column, so the cost does not grow with the number of
+# rows. Every share compared against a threshold also yields a confidence that
+# the full column would land on the same side; columns whose weakest decision
+# falls below MIN_CONFIDENCE are re-checked on all of their values.
+SAMPLE_SIZE = 1000
+MIN_CONFIDENCE = 0.95
+# Values the categorical/text distinct-ratio rule is measured on
+CARDINALITY_SAMPLE = SAMPLE_SIZE
+# An "every value" rule is trusted once the sample rules out a 1% violation rate
+ALL_TOLERANCE = 0.01
+
+# Column-name hints, checked before the content rules
+PHONE_NAME_RE = re.compile(r"phone|ph\s*no|contact", re.IGNORECASE)
+DATE_NAME_RE = re.compile(r"date", re.IGNORECASE)
+CURRENCY_NAME_RE = re.compile(r"salary|price|amount|cost|currency", re.IGNORECASE)
+POSTAL_NAME_RE = re.compile(r"zip|postal|post\s*code|pin\s*code", re.IGNORECASE)
+
+# Content patterns
+CURRENCY_RE = r"(?i)[\$₹€]|USD|INR|Rs"
+PHONE_RE = r"^\+?[\d\s\-().]+$"
+DATE_RE = (
+    r"(?i)^\d{1,4}[./\-\s]\d{1,2}[./\-\s]\d{1,4}$"
+    r"|^\d{1,2}\s*(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?,?\s*\d{2,4}$"
+    r"|^(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?\s*\d{1,2},?\s*\d{2,4}$"
+)
+BOOLEAN_VALUES = {"true", "false", "t", "f", "yes", "no", "y", "n"}
+
+DATE_SHARE = 0.8
+CURRENCY_SHARE = 0.6
+PHONE_SHARE = 0.8
+NUMERIC_SHARE = 0.95
+CATEGORICAL_RATIO = 0.5
+
+
+def stratified_positions(length, sample_size=SAMPLE_SIZE, seed=0):
+    # One random row from each of sample_size equal slices of the column, so the
+    # sample covers the whole file instead of favouring its top
+    if sample_size is None or length <= sample_size:
+        return np.arange(length)
+    edges = np.linspace(0, length, sample_size + 1)
+    offsets = np.random.default_rng(seed).random(sample_size)
+    return (edges[:-1] + offsets * np.diff(edges)).astype(int)
+
+
+def sample_values(series, sample_size=SAMPLE_SIZE):
+    values = series.iloc[stratified_positions(len(series), sample_size)].dropna()
+    return values.astype(str).str.strip()
+
+
+def _share(mask):
+    return float(mask.mean()) if len(mask) else 0.0
+
+
+def _share_confidence(share, threshold, n, population):
+    # Normal approximation with finite population correction: how likely the
+    # full column's share is on the same side of the threshold as the sample's
+    if n >= population:
+        return 1.0
+    p = min(max(share, 0.5 / n), 1 - 0.5 / n)
+    se = sqrt(p * (1 - p) / n * (population - n) / (population - 1))
+    return 0.5 * (1 + erf(abs(share - threshold) / (se * sqrt(2))))
+
+
+def _all_confidence(all_match, n, population):
+    if not all_match or n >= population:
+        return 1.0
+    return 1 - (1 - ALL_TOLERANCE) ** n
+
+
+def detect_column_type_with_confidence(series, name, sample_size=SAMPLE_SIZE):
+    # Returns (type, confidence); confidence is the weakest of the sampled
+    # decisions taken on the way, since flipping any of them changes the type
+    name = str(name)
+    values = sample_values(series, sample_size)
+    if values.empty:
+        return "unknown", 1.0
+
+    if pd.api.types.is_bool_dtype(series):
+        return "boolean", 1.0
+
+    n = len(values)
+    # Non-null values in the whole column, estimated from the sample's null rate
+    positions = min(len(series), sample_size or len(series))
+    population = n if positions == len(series) else max(n, round(len(series) * n / positions))
+    confidences = []
+
+    def passes(share, threshold):
+        confidences.append(_share_confidence(share, threshold, n, population))
+        return share >= threshold
+
+    def result(inferred_type):
+        return inferred_type, min(confidences, default=1.0)
+
+    date_share = _share(values.str.match(DATE_RE))
+    if DATE_NAME_RE.search(name) and passes(date_share, DATE_SHARE):
+        return result("date")
+
+    if PHONE_NAME_RE.search(name):
+        return result("phone")
+
+    if POSTAL_NAME_RE.search(name):
+        return result("postal")
+
+    if CURRENCY_NAME_RE.search(name) or passes(_share(values.str.contains(CURRENCY_RE)), CURRENCY_SHARE):
+        return result("currency")
+
+    lowered = values.str.lower()
+    all_boolean = bool(lowered.isin(BOOLEAN_VALUES).all())
+    confidences.append(_all_confidence(all_boolean, n, population))
+    if all_boolean:
+        return result("boolean")
+
+    numeric = pd.to_numeric(values.str.replace(r"\s+", "", regex=True), errors="coerce")
+    if passes(_share(numeric.notna()), NUMERIC_SHARE):
+        return result("numeric")
+
+    if passes(date_share, DATE_SHARE):
+        return result("date")
+
+    digits = values.str.replace(r"\D", "", regex=True).str.len()
+    if passes(_share(values.str.match(PHONE_RE) & (digits >= 10)), PHONE_SHARE):
+        return result("phone")
+
+    # Distinct counts do not scale with the sample like shares do, so the
+    # cardinality rule is defined on a fixed-size sample whatever sample_size is
+    if sample_size != CARDINALITY_SAMPLE:
+        lowered = sample_values(series, CARDINALITY_SAMPLE).str.lower()
+    if lowered.nunique() <= max(1, len(lowered) * CATEGORICAL_RATIO):
+        return result("categorical")
+    return result("text")
+
+
+def detect_column_type(series, name, sample_size=SAMPLE_SIZE):
+    return detect_column_type_with_confidence(series, name, sample_size)[0]
+
+
+def detect_column_types_with_confidence(df, sample_size=SAMPLE_SIZE, min_confidence=MIN_CONFIDENCE, known=None):
+    # {col: type}, {col: confidence}, [cols that needed a full scan]. known maps
+    # columns already typed on their first rows (from the cache) to
+    # (type, confidence, rows): only the rows after those are checked.
+    known = known or {}
+    inferred_types, confidences, escalated = {}, {}, []
+    for col in df.columns:
+        if col in known:
+            known_type, known_confidence, rows = known[col]
+            new_rows = df[col].iloc[rows:]
+            if new_rows.dropna().empty:
+                inferred_types[col], confidences[col] = known_type, known_confidence
+                continue
+            inferred_type, confidence = detect_column_type_with_confidence(new_rows, col, sample_size)
+            if inferred_type == known_type and confidence >= min_confidence:
+                inferred_types[col], confidences[col] = known_type, round(min(confidence, known_confidence), 4)
+                continue
+
+        inferred_type, confidence = detect_column_type_with_confidence(df[col], col, sample_size)
+        if confidence < min_confidence and sample_size is not None and len(df) > sample_size:
+            inferred_type, confidence = detect_column_type_with_confidence(df[col], col, None)
+            escalated.append(col)
+        inferred_types[col] = inferred_type
+        confidences[col] = round(confidence, 4)
+    return inferred_types, confidences, escalated
+
+
+def detect_column_types(df, sample_size=SAMPLE_SIZE):
+    return detect_column_types_with_confidence(df, sample_size)[0]
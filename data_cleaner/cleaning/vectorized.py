@@ -0,0 +1,119 @@
+import re
+import numpy as np
+import pandas as pd
+from cleaning.engine import arrow_engine, arrow_text
+
+# Vectorized counterparts of the per-cell normalizers. Each function gives the
+# same values as Series.apply(<scalar normalizer>) but works through the .str
+# accessor. The keyword flags select the behaviour of format_cleaning.py
+# (default) or format_normalizer.py.
+#
+# Patterns are kept as plain strings so Arrow-backed string columns run them
+# natively; RE2's \d is ASCII-only, so non-ASCII text uses Python's re instead.
+
+NON_DIGIT_RE = re.compile(r"\D")
+ASCII_NON_DIGIT = r"[^0-9]"
+NON_ASCII = r"[^\x00-\x7f]"
+NON_NUMERIC = r"[^0-9.\-]"
+FLOAT = r"-?(?:[0-9]+\.?[0-9]*|\.[0-9]+)"
+
+TRUE_VALUES = ["true", "t", "yes", "y", "1"]
+FALSE_VALUES = ["false", "f", "no", "n", "0"]
+
+
+def _as_text(series):
+    # str(val) for every non-null cell, like the scalar normalizers do
+    mask = series.notna().to_numpy()
+    if arrow_engine():
+        # Arrow-backed text runs the .str calls below as Arrow kernels
+        return mask, arrow_text(series[mask])
+    return mask, series[mask].astype(object).astype(str)
+
+
+def _digits_only(text):
+    if text.str.contains(NON_ASCII, regex=True).any():
+        return text.str.replace(NON_DIGIT_RE, "", regex=True)
+    return text.str.replace(ASCII_NON_DIGIT, "", regex=True)
+
+
+def _assign(series, positions, values):
+    result = series.to_numpy(dtype=object, copy=True)
+    result[positions] = values
+    return pd.Series(result, index=series.index, name=series.name).infer_objects()
+
+
+def normalize_phone_series(series, flag_foreign=True):
+    mask, text = _as_text(series)
+    digits = _digits_only(text)
+    long_enough = (digits.str.len() >= 10).to_numpy()
+    text, digits = text[long_enough], digits[long_enough]
+
+    number = digits.str[-10:]
+    code = digits.str[:-10]
+    has_code = (code != "").to_numpy()
+    if flag_foreign:
+        values = ("+91 " + number).to_numpy(dtype=object)
+        # Foreign numbers keep their original text inside an Excel formula
+        foreign = has_code & (code != "91").to_numpy()
+        values[foreign] = ('=HYPERLINK("", "' + text[foreign] + '")').to_numpy(dtype=object)
+    else:
+        values = ("+" + code + " " + number).to_numpy(dtype=object)
+        values[~has_code] = ("+91 " + number[~has_code]).to_numpy(dtype=object)
+
+    positions = np.flatnonzero(mask)[long_enough]
+    return _assign(series, positions, values)
+
+
+def normalize_currency_series(series, multipliers=True):
+    mask, text = _as_text(series)
+    if not multipliers:
+        text = text.str.replace(",", "", regex=False)
+    text = text.str.strip()
+
+    percent = text.str.endswith("%").to_numpy()
+    cleaned = text.str.replace(NON_NUMERIC, "", regex=True)
+    valid = cleaned.str.fullmatch(FLOAT).fillna(False).to_numpy(dtype=bool) & ~percent
+
+    amounts = cleaned[valid].astype(object).to_numpy().astype(float)
+    if multipliers:
+        lowered = text[valid].str.lower()
+        thousands = (lowered.str.contains("k", regex=False) | lowered.str.contains("thousand", regex=False)).to_numpy()
+        millions = (lowered.str.contains("m", regex=False) | lowered.str.contains("million", regex=False)).to_numpy()
+        amounts = amounts * np.where(thousands, 1_000, np.where(millions, 1_000_000, 1))
+
+    positions = np.flatnonzero(mask)
+    result = series.to_numpy(dtype=object, copy=True)
+    result[positions[percent]] = text[percent].to_numpy(dtype=object)
+    result[positions[valid]] = amounts
+    return pd.Series(result, index=series.index, name=series.name).infer_objects()
+
+
+def normalize_boolean_series(series, exact_values=True):
+    mask, text = _as_text(series)
+    lowered = text.str.strip().str.lower()
+    first = lowered.str[:1]
+
+    if exact_values:
+        # Exact matches first, then first-letter logic only for short values
+        short = lowered.str.len() <= 4
+        is_true = lowered.isin(TRUE_VALUES) | (short & first.isin(["t", "y", "1"]))
+        is_false = (lowered.isin(FALSE_VALUES) | (short & first.isin(["f", "n", "0"]))) & ~is_true
+        unsure = None
+    else:
+        is_true = first.isin(["t", "y", "1"])
+        is_false = first.isin(["f", "n", "0"]) & ~is_true
+        # format_normalizer returns the lowered text when unsure
+        unsure = (~is_true & ~is_false).to_numpy()
+
+    positions = np.flatnonzero(mask)
+    result = series.to_numpy(dtype=object, copy=True)
+    result[positions[is_true.to_numpy()]] = True
+    result[positions[is_false.to_numpy()]] = False
+    if unsure is not None:
+        result[positions[unsure]] = lowered[unsure].to_numpy(dtype=object)
+    return pd.Series(result, index=series.index, name=series.name).infer_objects()
+
+
+def strip_series(series):
+    mask, text = _as_text(series)
+    return _assign(series, np.flatnonzero(mask), text.str.strip().to_numpy(dtype=object))
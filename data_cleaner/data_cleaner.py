@@ -1,19 +1,44 @@
 import sys
+import argparse
+from pathlib import Path
 import pandas as pd
 from termcolor import cprint
-from cleaning.inference import suggest_and_fix_column_types
-from cleaning.io import load_file, save_file
+from cleaning.inference import suggest_and_fix_column_types, INFERENCE_BACKENDS
+from cleaning.type_detection import SAMPLE_SIZE, MIN_CONFIDENCE
+from cleaning.io import load_file, save_file, MalformedCSVError, CSV_CHUNKSIZE
 from cleaning.core import (    check_and_fix_headers,
     handle_duplicates_by_column,
-    handle_null_rows
+    handle_null_rows,
+    KEEP_POLICIES
 )
+from cleaning.near_duplicates import NEAR_DUPLICATE_THRESHOLD
 
-from pyfiglet import Figlet
-from colorama import init
+from colorama import init, Fore, Style
 from cleaning.format_cleaning import clean_and_preview_categoricals
+from cleaning.streaming import clean_in_chunks
+from cleaning.plan import load_plan, save_plan, missing_sections
+from cleaning.prompts import ask_yes_no
+from cleaning.batch import (
+    expand_inputs,
+    batch_outputs,
+    clean_captured,
+    run_batch,
+    print_result,
+    print_batch_summary,
+    write_batch_summary,
+    SUMMARY_FILE
+)
+from cleaning.cache import enable_cache, flush_cache, print_cache_summary, DEFAULT_CACHE_DIR, DEFAULT_CACHE_MB
+from cleaning.dtypes import compact_dtypes
+from cleaning.engine import set_engine, ENGINES
+from cleaning.report import enable_report, write_report, REPORT_FORMATS
+from cleaning.instrumentation import enable_profiling, run_stage, print_profile_summary, write_trace
 init()
 
 def show_banner(font='starwars'):
+    # pyfiglet loads its font files on import, so it stays out of --quiet runs
+    from pyfiglet import Figlet
+
     def center_text(text, width=80):
         return "\n".join(line.center(width) for line in text.splitlines())
 
@@ -23,31 +48,246 @@ def show_banner(font='starwars'):
 
     cprint(centered_banner, 'yellow', attrs=['bold'])
 
-def main():
-    if len(sys.argv) < 2:
-        cprint("❌ Please provide the path to a CSV file.", "red")
-        sys.exit(1)
-    
-    show_banner()
+def similarity_threshold(text):
+    try:
+        value = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid threshold: {text!r}")
+    if not 0 <= value <= 100:
+        raise argparse.ArgumentTypeError(f"threshold must be between 0 and 100, got {value}")
+    return value
+
+def worker_count(text):
+    try:
+        value = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid worker count: {text!r}")
+    if value < 0:
+        raise argparse.ArgumentTypeError(f"worker count must be 0 (one per CPU core) or more, got {value}")
+    return value
+
+def _bare_fuzzy_flag(argv):
+    # "--fuzzy-dedupe data.csv" would take the file as the threshold, so a
+    # flag not followed by a number gets its default threshold spelled out
+    argv = list(argv)
+    for i, arg in enumerate(argv):
+        following = argv[i + 1] if i + 1 < len(argv) else ""
+        try:
+            float(following)
+        except ValueError:
+            if arg == "--fuzzy-dedupe":
+                argv[i] = f"--fuzzy-dedupe={NEAR_DUPLICATE_THRESHOLD}"
+    return argv
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Clean a CSV or XLSX file interactively.")
+    parser.add_argument("filepath", nargs="?",
+                        help="Path to the CSV/XLSX file to clean (with --batch: a directory, glob or manifest file)")
+    parser.add_argument("--batch", action="store_true",
+                        help="Clean every file of a directory, glob or manifest (one path per line); "
+                             "--workers then spreads files over processes")
+    parser.add_argument("--output-dir", metavar="DIR",
+                        help="With --batch, write the cleaned files here (default: next to each input)")
+    parser.add_argument("--stream", action="store_true",
+                        help="Clean a CSV chunk by chunk with flat memory (decisions are taken on a sample)")
+    parser.add_argument("--chunksize", type=int, default=CSV_CHUNKSIZE,
+                        help="Rows per chunk in streaming mode")
+    parser.add_argument("--keep", choices=KEEP_POLICIES, default="ask",
+                        help="How to resolve duplicate keys whose rows differ (default: ask for each)")
+    parser.add_argument("--newest-by", metavar="COLUMN",
+                        help="Column used by --keep newest")
+    parser.add_argument("--fuzzy-dedupe", type=similarity_threshold, nargs="?", const=NEAR_DUPLICATE_THRESHOLD, metavar="THRESHOLD",
+                        help="Also treat rows whose dedupe keys are this similar (0-100, default "
+                             f"{NEAR_DUPLICATE_THRESHOLD}) as duplicates, e.g. 'John Doe' and 'john  doe'")
+    parser.add_argument("--engine", choices=ENGINES, default="pandas",
+                        help="Run CSV parsing, dedupe and the vectorized normalizers on pandas (default) "
+                             "or on pyarrow's multi-threaded kernels; with arrow, --workers uses threads")
+    parser.add_argument("--inference", choices=INFERENCE_BACKENDS, default="native",
+                        help="Column type inference backend (ydata needs ydata-profiling installed)")
+    parser.add_argument("--sample-size", type=int, default=SAMPLE_SIZE, metavar="N",
+                        help="Rows sampled per column for type inference (stratified across the file)")
+    parser.add_argument("--min-confidence", type=float, default=MIN_CONFIDENCE, metavar="P",
+                        help="Re-check a column on all rows when its inferred type is less certain than this")
+    parser.add_argument("--workers", type=worker_count, default=1, metavar="N",
+                        help="Parse large CSVs and normalize columns in N processes (0 = one per CPU core)")
+    parser.add_argument("--no-compact", dest="compact", action="store_false",
+                        help="Keep the inferred columns as plain strings/floats instead of compact dtypes")
+    parser.add_argument("--plan", metavar="PATH",
+                        help="Replay a saved cleaning plan (JSON/YAML) instead of prompting")
+    parser.add_argument("--save-plan", metavar="PATH",
+                        help="Write the decisions taken during this run to a cleaning plan (JSON/YAML)")
+    parser.add_argument("--cache", nargs="?", const=str(DEFAULT_CACHE_DIR), metavar="DIR",
+                        help=f"Reuse types, dedupe choices, date parses and typo fixes from earlier runs "
+                             f"(default dir: {DEFAULT_CACHE_DIR})")
+    parser.add_argument("--cache-size", type=float, default=DEFAULT_CACHE_MB, metavar="MB",
+                        help="Evict least recently used cache entries above this size")
+    parser.add_argument("--report", metavar="PATH",
+                        help="Write every null cell, categorical value and typo fix to a CSV/JSON/HTML report "
+                             "(the console only shows a preview)")
+    parser.add_argument("--profile", nargs="?", const="profile_trace.json", metavar="TRACE_PATH",
+                        help="Print per-stage timings and write a Chrome trace (default: profile_trace.json)")
+    parser.add_argument("--profile-cprofile", metavar="DIR",
+                        help="With --profile, dump a cProfile .prof file per stage into DIR")
+    parser.add_argument("--profile-memory", action="store_true",
+                        help="With --profile, track Python peak memory per stage with tracemalloc (slow)")
+    parser.add_argument("--sheet", metavar="NAME_OR_INDEX",
+                        help="Worksheet to read from an XLSX file (default: the first one)")
+    parser.add_argument("--output-format", choices=["csv", "xlsx", "parquet", "feather"],
+                        help="Write the cleaned file in this format (default: same as the input)")
+    parser.add_argument("-q", "--quiet", "--no-banner", dest="quiet", action="store_true",
+                        help="Skip the startup banner (for scripted runs over many files)")
+    args = parser.parse_args(_bare_fuzzy_flag(argv))
+    if args.keep == "newest" and not args.newest_by:
+        parser.error("--keep newest needs --newest-by COLUMN")
+    return args
+
+def stream_path_error(filepath, output_path):
+    if not filepath.lower().endswith((".csv", ".xlsx", ".xlsm")):
+        return "Streaming mode only supports CSV and XLSX/XLSM files."
+    if not output_path.lower().endswith(".csv"):
+        return "Streaming mode only writes CSV output (use --output-format csv)."
+    return None
+
+def clean_file(filepath, output_path, args, plan):
+    # The whole pipeline for one file; returns the number of rows written
+    # (None in streaming mode, which never holds the whole file)
+    set_engine(args.engine)
+    if args.stream:
+        error = stream_path_error(filepath, output_path)
+        if error:
+            raise ValueError(error)
+        if args.fuzzy_dedupe is not None:
+            print(f"{Fore.YELLOW}⚠️ Streaming mode only removes exact duplicates; ignoring --fuzzy-dedupe.{Style.RESET_ALL}")
+        run_stage("clean_in_chunks", clean_in_chunks, filepath, output_path, chunksize=args.chunksize,
+                  keep=args.keep, newest_by=args.newest_by, plan=plan,
+                  inference=args.inference, sheet=args.sheet,
+                  sample_size=args.sample_size, min_confidence=args.min_confidence)
+        flush_cache()
+        return None
+
+    df = run_stage("load_file", load_file, filepath, sheet=args.sheet, workers=args.workers)
 
-    filepath = sys.argv[1]
-    df = load_file(filepath)
-    
     #core.py functions
-    df= check_and_fix_headers(df)
-    df = suggest_and_fix_column_types(df)
-    df = handle_duplicates_by_column(df)
-    df = handle_null_rows(df)
+    df= run_stage("check_and_fix_headers", check_and_fix_headers, df, plan=plan)
+    df = run_stage("suggest_and_fix_column_types", suggest_and_fix_column_types, df, plan=plan, backend=args.inference,
+                   sample_size=args.sample_size, min_confidence=args.min_confidence)
+    if args.compact:
+        df = run_stage("compact_dtypes", compact_dtypes, df)
+    df = run_stage("handle_duplicates_by_column", handle_duplicates_by_column, df, keep=args.keep, newest_by=args.newest_by, plan=plan,
+                   fuzzy=args.fuzzy_dedupe)
+    df = run_stage("handle_null_rows", handle_null_rows, df, plan=plan)
 
-    # Run type inference and fix types
-    
     #format_cleaner.category
-    df=clean_and_preview_categoricals(df)
+    df=run_stage("clean_and_preview_categoricals", clean_and_preview_categoricals, df, workers=args.workers)
 
     # Save the cleaned file
+    run_stage("save_file", save_file, df, output_path)
+    flush_cache()
+    return len(df)
+
+def main_batch(args, plan):
+    if args.report or args.profile:
+        cprint("❌ --report and --profile work on a single file, not with --batch.", "red")
+        sys.exit(1)
+    files = expand_inputs(args.filepath)
+    if not files:
+        cprint(f"❌ No CSV/XLSX/Parquet/Feather files found for: {args.filepath}", "red")
+        sys.exit(1)
+
+    try:
+        outputs = batch_outputs(files, args.output_dir, args.output_format)
+    except ValueError as e:
+        cprint(f"❌ {e}", "red")
+        sys.exit(1)
+
+    # Files are cleaned one per process, so each one normalizes its columns serially
+    options = argparse.Namespace(**{**vars(args), "workers": 1})
+    results = []
+    if missing_sections(plan):
+        # Workers cannot prompt, so whatever the plan (if any) leaves open is
+        # asked on the first file that loads, cleaned interactively here, and
+        # the answers are replayed on every other file
+        if args.plan:
+            print(f"{Fore.YELLOW}⚠️ The cleaning plan has no {', '.join(missing_sections(plan))} section(s); asking on the first file.{Style.RESET_ALL}")
+        while files and set(missing_sections(plan)) - {"nulls"}:
+            filepath, output_path = files.pop(0), outputs.pop(0)
+            print(f"\n{Fore.MAGENTA}📋 Deciding the cleaning plan on {filepath}{Style.RESET_ALL}")
+            results.append(clean_captured(clean_file, filepath, output_path, options, plan, capture=False))
+            print_result(results[-1])
+        if files and "nulls" not in plan:
+            drop = ask_yes_no("Would you like to delete rows with null values in the other files?")
+            plan["nulls"] = "drop" if drop else "highlight"
+        if args.save_plan:
+            save_plan(plan, args.save_plan)
+
+    if files:
+        cache_args = (args.cache, args.cache_size) if args.cache else None
+        results += run_batch(files, outputs, clean_file, options, plan, args.workers,
+                             initializer=enable_cache if cache_args else None, initargs=cache_args or ())
+
+    print_batch_summary(results)
+    if args.output_dir:
+        write_batch_summary(results, Path(args.output_dir) / SUMMARY_FILE)
+    print_cache_summary()
+    if any(r["status"] != "ok" for r in results):
+        sys.exit(1)
+
+def main():
+    args = parse_args(sys.argv[1:])
+    if not args.filepath:
+        cprint("❌ Please provide the path to a CSV file.", "red")
+        sys.exit(1)
+    
+    if not args.quiet:
+        show_banner()
+
+    filepath = args.filepath
     output_path = filepath.replace(".", "_cleaned.", 1)
-    save_file(df, output_path)
+    if args.output_format:
+        output_path = str(Path(output_path).with_suffix("." + args.output_format))
+    try:
+        plan = load_plan(args.plan) if args.plan else {}
+    except (ValueError, ImportError, FileNotFoundError) as e:
+        cprint(f"❌ {e}", "red")
+        sys.exit(1)
+    try:
+        set_engine(args.engine)
+    except ImportError as e:
+        cprint(f"❌ {e}", "red")
+        sys.exit(1)
+    if args.report:
+        if Path(args.report).suffix.lower() not in REPORT_FORMATS:
+            cprint(f"❌ Report must be one of: {', '.join(REPORT_FORMATS)}", "red")
+            sys.exit(1)
+        enable_report()
+    if args.cache:
+        enable_cache(args.cache, args.cache_size)
+    if args.profile:
+        enable_profiling(cprofile_dir=args.profile_cprofile, trace_memory=args.profile_memory)
+
+    if args.batch:
+        main_batch(args, plan)
+        return
+
+    if args.stream:
+        error = stream_path_error(filepath, output_path)
+        if error:
+            cprint(f"❌ {error}", "red")
+            sys.exit(1)
+    try:
+        clean_file(filepath, output_path, args, plan)
+    except MalformedCSVError:
+        sys.exit(1)
+
     cprint(f"\n✅ Cleaned file saved to: {output_path}", "green")
+    if args.save_plan:
+        save_plan(plan, args.save_plan)
+    if args.report:
+        write_report(args.report)
+    print_cache_summary()
+    if args.profile:
+        print_profile_summary()
+        write_trace(args.profile)
 
 
 if __name__ == "__main__":
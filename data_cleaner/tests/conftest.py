@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# The cleaning package is imported the way data_cleaner.py imports it
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
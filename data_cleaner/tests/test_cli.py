@@ -0,0 +1,55 @@
+import sys
+import pytest
+import data_cleaner
+from data_cleaner import parse_args
+
+
+@pytest.mark.parametrize("workers", ["-1", "-8", "two"])
+def test_rejects_invalid_worker_counts(workers):
+    with pytest.raises(SystemExit):
+        parse_args(["data.csv", "--workers", workers])
+
+
+def test_zero_workers_means_one_per_core():
+    assert parse_args(["data.csv", "--workers", "0"]).workers == 0
+
+
+def test_batch_asks_what_the_plan_leaves_open_on_the_first_file(tmp_path, monkeypatch):
+    for name in ["a.csv", "b.csv", "c.csv"]:
+        (tmp_path / name).write_text("id\n1\n")
+    plan = {"headers": {}, "dedupe": {"columns": []}}
+    interactive, batched = [], []
+
+    def clean_captured(clean, filepath, output_path, options, plan, capture=True):
+        interactive.append((filepath, capture))
+        plan["column_types"] = {"id": "numeric"}
+        return {"file": filepath, "status": "ok"}
+
+    def run_batch(files, outputs, clean, options, plan, workers=1, **kwargs):
+        batched.append((files, dict(plan)))
+        return []
+
+    monkeypatch.setattr(data_cleaner, "clean_captured", clean_captured)
+    monkeypatch.setattr(data_cleaner, "run_batch", run_batch)
+    monkeypatch.setattr(data_cleaner, "ask_yes_no", lambda question: True)
+    monkeypatch.setattr(data_cleaner, "print_result", lambda result: None)
+    args = parse_args([str(tmp_path), "--batch", "--plan", "plan.json"])
+
+    data_cleaner.main_batch(args, plan)
+    assert interactive == [(str(tmp_path / "a.csv"), False)]
+    files, replayed = batched[0]
+    assert files == [str(tmp_path / "b.csv"), str(tmp_path / "c.csv")]
+    assert replayed["column_types"] == {"id": "numeric"} and replayed["nulls"] == "drop"
+
+
+@pytest.mark.parametrize("plan_name", ["missing.json", "plan.yaml"])
+def test_unusable_plan_is_reported(tmp_path, monkeypatch, capsys, plan_name):
+    (tmp_path / "plan.yaml").write_text("nulls: drop\n")
+    # PyYAML is optional
+    monkeypatch.setitem(sys.modules, "yaml", None)
+    monkeypatch.setattr(sys, "argv", ["data_cleaner.py", "data.csv", "-q", "--plan", str(tmp_path / plan_name)])
+
+    with pytest.raises(SystemExit) as caught:
+        data_cleaner.main()
+    assert caught.value.code == 1
+    assert "❌" in capsys.readouterr().out
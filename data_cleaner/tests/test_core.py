@@ -0,0 +1,25 @@
+import pandas as pd
+import pytest
+from cleaning.core import apply_header_plan
+
+HEADER_PLAN = {
+    "source_columns": ["id", "name", "city"],
+    "keep_positions": [0, 1, 2],
+    "header_is_data": False,
+    "columns": ["id", "name", "city"],
+}
+
+
+def test_header_plan_renames_the_columns_it_was_made_for():
+    df = pd.DataFrame([[1, "a", "x"]], columns=["id", "name", "city"])
+    plan = {**HEADER_PLAN, "columns": ["id", "full_name", "city"]}
+
+    assert list(apply_header_plan(df, plan).columns) == ["id", "full_name", "city"]
+
+
+@pytest.mark.parametrize("columns", [["id", "city", "name"], ["id", "name", "town"]])
+def test_header_plan_rejects_other_headers_of_the_same_width(columns):
+    df = pd.DataFrame([[1, "a", "x"]], columns=columns)
+
+    with pytest.raises(ValueError):
+        apply_header_plan(df, HEADER_PLAN)
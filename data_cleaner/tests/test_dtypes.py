@@ -0,0 +1,13 @@
+import pandas as pd
+from cleaning.dtypes import compact_dtypes
+
+
+def test_compacting_does_not_change_the_written_csv():
+    df = pd.DataFrame({
+        "amount": [20000000.0, 16777216.0, 1e10, None],
+        "id": [1, 2, 3, 4],
+        "city": ["Oslo", "Oslo", "Oslo", "Rome"],
+    })
+    expected = df.to_csv(index=False)
+
+    assert compact_dtypes(df.copy()).to_csv(index=False) == expected
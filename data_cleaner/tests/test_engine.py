@@ -0,0 +1,32 @@
+import pandas as pd
+import pytest
+from cleaning.engine import set_engine
+from cleaning.io import load_file
+
+pytest.importorskip("pyarrow")
+
+
+def load_with_both_engines(path):
+    set_engine("pandas")
+    expected = load_file(str(path))
+    set_engine("arrow")
+    try:
+        return load_file(str(path)), expected
+    finally:
+        set_engine("pandas")
+
+
+@pytest.mark.parametrize("name, text", [
+    ("na_strings", "id,score\n1,None\n2,n/a\n3,<NA>\n4,NULL\n5,5\n"),
+    ("dates_and_times", "id,joined,at\n1,2024-01-02,10:30:00\n2,2024-01-03,11:00:00\n"),
+    ("one_zero_flags", "id,flag,active\n1,1,True\n2,True,false\n3,0,TRUE\n"),
+    ("blank_header", "a,,b\n1,2,3\n"),
+    ("duplicate_header", "a,b,a\n1,2,3\n"),
+    ("huge_integers", "id,big\n1,18446744073709551615\n2,99999999999999999999\n"),
+])
+def test_arrow_reads_csv_like_pandas(tmp_path, name, text):
+    path = tmp_path / f"{name}.csv"
+    path.write_text(text)
+    arrow, expected = load_with_both_engines(path)
+    arrow.attrs, expected.attrs = {}, {}
+    pd.testing.assert_frame_equal(arrow, expected)
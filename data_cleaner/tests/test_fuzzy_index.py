@@ -0,0 +1,15 @@
+import pytest
+from cleaning import fuzzy_index
+
+pytest.importorskip("rapidfuzz")
+
+
+def test_scoring_in_blocks_finds_the_same_matches(monkeypatch):
+    references = ["london", "paris", "berlin", "madrid", "lisbon", "dublin", "vienna"]
+    queries = ["londn", "pariss", "berlinn", "madird", "lisbn", "dubln", "viena", "zzzzzz", "berlim"]
+    expected = fuzzy_index._score_matches(queries, references, 80)
+
+    monkeypatch.setattr(fuzzy_index, "QUERY_BLOCK_ROWS", 2)
+    monkeypatch.setattr(fuzzy_index, "SCORE_BLOCK_CELLS", 3)
+    assert fuzzy_index._score_matches(queries, references, 80) == expected
+    assert expected["londn"] == "london" and "zzzzzz" not in expected
@@ -0,0 +1,116 @@
+import numpy as np
+import pandas as pd
+import pytest
+from cleaning import streaming
+from cleaning.io import load_file, save_file, iter_csv_chunks, iter_file_chunks, MalformedCSVError
+
+pytest.importorskip("pyarrow")
+
+
+@pytest.mark.parametrize("suffix", [".parquet", ".feather"])
+def test_columnar_output_keeps_mixed_normalizer_columns(tmp_path, suffix):
+    # What the currency and boolean normalizers leave behind on purpose
+    df = pd.DataFrame({
+        "id": [1, 2, 3, 4],
+        "salary": pd.Series([50000.0, "5%", np.nan, 4000.0], dtype=object),
+        "flag": pd.Series([True, "maybe", False, None], dtype=object),
+        "active": pd.Series([True, False, None, True], dtype=object),
+    })
+    df.attrs["inferred_types"] = {"salary": "currency", "flag": "boolean"}
+    df.attrs["highlight_nulls"] = [2, 3]
+    path = tmp_path / f"out{suffix}"
+
+    save_file(df, str(path))
+    result = load_file(str(path))
+
+    assert result["salary"].tolist()[:2] == ["50000.0", "5%"]
+    assert pd.isna(result["salary"][2])
+    assert result["flag"].tolist()[:3] == ["True", "maybe", "False"]
+    assert pd.isna(result["flag"][3])
+    # Single-type columns keep their type
+    assert result["active"].tolist()[:2] == [True, False]
+    assert result["id"].tolist() == [1, 2, 3, 4]
+    assert result.attrs["inferred_types"] == df.attrs["inferred_types"]
+    # Row positions go stale once the rows are cleaned again
+    assert "highlight_nulls" not in result.attrs
+
+
+@pytest.mark.parametrize("text", [
+    "a,b,c\n1,2,3\n4,5\n6,7,8\n",
+    "a,b,c\n1,2,3\n\"x\ny\",5\n6,7,\n",
+])
+def test_short_rows_are_malformed(tmp_path, text):
+    path = tmp_path / "short.csv"
+    path.write_text(text)
+
+    with pytest.raises(MalformedCSVError) as caught:
+        load_file(str(path))
+    assert caught.value.bad_rows == [(3, 3, 2)]
+    with pytest.raises(MalformedCSVError):
+        list(iter_csv_chunks(str(path), chunksize=1))
+
+
+@pytest.mark.parametrize("text, bad_rows", [
+    # An extra field in the first row must not turn id into the index
+    ("id,name,salary\n1,John,USD 80,000\n2,Jane,USD 60,000\n", [(2, 3, 4), (3, 3, 4)]),
+    ("id,name,salary\n0,Ann,B\n1,John,USD 80,000\n", [(3, 3, 4)]),
+])
+def test_long_rows_are_malformed(tmp_path, text, bad_rows):
+    path = tmp_path / "long.csv"
+    path.write_text(text)
+
+    with pytest.raises(MalformedCSVError) as caught:
+        load_file(str(path))
+    assert caught.value.bad_rows == bad_rows
+    # The parser cuts a long first row of a chunk without a warning
+    with pytest.raises(MalformedCSVError) as caught:
+        list(iter_csv_chunks(str(path), chunksize=1))
+    assert caught.value.bad_rows == bad_rows
+
+
+def test_empty_trailing_fields_are_not_short_rows(tmp_path):
+    path = tmp_path / "trailing.csv"
+    path.write_text("a,b,c\n1,2,\n\n 3, \"4,5\",\n")
+
+    assert load_file(str(path))["b"].tolist() == ["2", "4,5"]
+
+
+def test_failed_stream_leaves_no_output(tmp_path, monkeypatch):
+    path = tmp_path / "data.csv"
+    path.write_text("a,b\n" + "".join(f"{i},x{i}\n" for i in range(10)))
+    output = tmp_path / "data_cleaned.csv"
+    plan = {
+        "headers": {"keep_positions": [0, 1], "header_is_data": False, "columns": ["a", "b"]},
+        "column_types": {"a": "numeric", "b": "text"},
+        "dedupe": {"columns": [], "keep": "first", "newest_by": None},
+        "nulls": "highlight",
+    }
+    written = []
+
+    def fail_on_second_chunk(df, output_path, append=False):
+        written.append(output_path)
+        if append:
+            raise OSError("disk full")
+        save_file(df, output_path, append)
+    monkeypatch.setattr(streaming, "save_file", fail_on_second_chunk)
+
+    with pytest.raises(OSError):
+        streaming.clean_in_chunks(str(path), str(output), chunksize=4, sample_rows=4, plan=plan)
+    assert not output.exists()
+    assert list(tmp_path.iterdir()) == [path]
+
+
+@pytest.mark.parametrize("header", [
+    ["a", None, "a", "a.1", "a", 2020, None, "b"],
+    [None, "Unnamed: 0", "u", "u"],
+])
+def test_streamed_xlsx_header_matches_read_excel(tmp_path, header):
+    openpyxl = pytest.importorskip("openpyxl")
+    path = tmp_path / "sheet.xlsx"
+    book = openpyxl.Workbook()
+    book.active.append(header)
+    book.active.append(list(range(len(header))))
+    book.save(path)
+
+    chunk = next(iter_file_chunks(str(path)))
+    assert list(chunk.columns) == list(pd.read_excel(path).columns)
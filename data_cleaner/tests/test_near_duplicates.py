@@ -0,0 +1,24 @@
+import pandas as pd
+import pytest
+from cleaning.near_duplicates import find_near_duplicates
+
+pytest.importorskip("rapidfuzz")
+
+
+def groups_of(values):
+    return [g.tolist() for g in find_near_duplicates(pd.DataFrame({"key": values}), ["key"])]
+
+
+@pytest.mark.parametrize("values, expected", [
+    # Each neighbour scores 90, the ends score 50
+    (["aaaaaaaaaa", "aaaaaaaaab", "aaaaaaaabb", "aaaaaaabbb", "aaaaaabbbb", "aaaaabbbbb"],
+     [[0, 1], [2, 3], [4, 5]]),
+    (["1234567890", "1234567891", "9234567892"], [[0, 1]]),
+])
+def test_matches_do_not_chain(values, expected):
+    assert groups_of(values) == expected
+
+
+def test_groups_rows_that_match_the_first_row():
+    values = ["John Doe", "Alice", "john  doe", "Jon Doe", "Bob", None, None, "ALICE!"]
+    assert groups_of(values) == [[0, 2, 3], [1, 7]]
@@ -0,0 +1,41 @@
+import pandas as pd
+from cleaning import instrumentation, parallel
+from cleaning.instrumentation import enable_profiling, run_stage, take_records, current_depth
+from cleaning.parallel import map_columns
+
+
+def upper(series, inferred_type):
+    return series.str.upper()
+
+
+def test_process_workers_send_back_only_their_own_stages(monkeypatch):
+    monkeypatch.setattr(instrumentation, "_options", None)
+    monkeypatch.setattr(instrumentation, "_records", [])
+    enable_profiling()
+    df = pd.DataFrame({"a": ["x", "y"], "b": ["z", "w"]})
+
+    run_stage("load_file", lambda: df)
+    df = map_columns(df, upper, {}, workers=2)
+
+    stages = [record["stage"] for record in take_records()]
+    assert sorted(stages) == ["load_file", "upper[-] a", "upper[-] b"]
+    assert df["a"].tolist() == ["X", "Y"]
+
+
+def test_thread_workers_nest_under_the_calling_stage(monkeypatch):
+    monkeypatch.setattr(instrumentation, "_options", None)
+    monkeypatch.setattr(instrumentation, "_records", [])
+    monkeypatch.setattr(parallel, "arrow_engine", lambda: True)
+    enable_profiling()
+    df = pd.DataFrame({"a": ["x", "y"], "b": ["z", "w"]})
+
+    run_stage("clean_and_preview_categoricals", map_columns, df, upper, {}, workers=2)
+
+    records = {record["stage"]: record for record in take_records()}
+    assert records["clean_and_preview_categoricals"]["depth"] == 0
+    for column in ["a", "b"]:
+        record = records[f"upper[-] {column}"]
+        assert record["depth"] == 1
+        # Memory and the date cache are shared with the other threads
+        assert record["memory_delta_mb"] is None and record["date_cache_hits"] is None
+    assert current_depth() == 0
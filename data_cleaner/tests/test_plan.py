@@ -0,0 +1,23 @@
+import json
+import pytest
+from cleaning.plan import load_plan
+
+
+@pytest.mark.parametrize("dedupe", [
+    {"columns": ["id"], "keep": "newest", "newest_by": None},
+    {"columns": ["id"], "keep": "newest"},
+    {"columns": ["id"], "keep": "first", "newest_by": None, "fuzzy": 150},
+])
+def test_load_plan_rejects_unusable_dedupe(tmp_path, dedupe):
+    path = tmp_path / "plan.json"
+    path.write_text(json.dumps({"dedupe": dedupe}))
+
+    with pytest.raises(ValueError):
+        load_plan(str(path))
+
+
+def test_load_plan_accepts_newest_with_a_column(tmp_path):
+    path = tmp_path / "plan.json"
+    path.write_text(json.dumps({"dedupe": {"columns": ["id"], "keep": "newest", "newest_by": "updated"}}))
+
+    assert load_plan(str(path))["dedupe"]["newest_by"] == "updated"
@@ -0,0 +1,30 @@
+from cleaning import streaming
+
+
+def test_stream_forwards_the_type_detection_sample(tmp_path, monkeypatch):
+    path = tmp_path / "data.csv"
+    path.write_text("a,b\n" + "".join(f"{i},x{i}\n" for i in range(10)))
+    plan = {"headers": {"keep_positions": [0, 1], "header_is_data": False, "columns": ["a", "b"]}}
+    seen = {}
+
+    def detect(df, plan, backend="native", sample_size=None, min_confidence=None):
+        seen.update(sample_size=sample_size, min_confidence=min_confidence)
+        plan["column_types"] = {"a": "numeric", "b": "text"}
+    monkeypatch.setattr(streaming, "suggest_and_fix_column_types", detect)
+
+    streaming.plan_from_sample(str(path), plan, sample_rows=5, sample_size=3, min_confidence=0.5)
+    assert seen == {"sample_size": 3, "min_confidence": 0.5}
+
+
+def test_keys_match_across_chunks_typed_apart(tmp_path):
+    # The second chunk's null makes its ids float64
+    path = tmp_path / "data.csv"
+    path.write_text("id,name\n1,a\n2,b\n3,c\n1,a\n2,b\n,c\n")
+    plan = {
+        "headers": {"keep_positions": [0, 1], "header_is_data": False, "columns": ["id", "name"]},
+        "column_types": {"id": "numeric", "name": "text"},
+        "dedupe": {"columns": ["id"], "keep": "first"},
+    }
+
+    keep = streaming.find_rows_to_keep(str(path), plan, chunksize=3, keep="first")
+    assert keep.tolist() == [True, True, True, False, False, True]